@@ -1,22 +1,33 @@
 # filename: kimi_coding_agent_v5.py
 import argparse
+import asyncio
 import json
 import logging
 import os
+import py_compile
+import stat
 import sys
 import subprocess
-import compileall
+import threading
+import functools
 import textwrap
 import urllib.error
 import urllib.parse
 import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 import yaml
 from pydantic import BaseModel, Field, ConfigDict, ValidationError, field_validator, model_validator
 
+try:  # optional C-accelerated JSON; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
 # Disable OpenAI tracing and other external services
 os.environ["OPENAI_AGENTS_TRACING"] = "false"
 os.environ["OPENAI_AGENTS_DISABLE_TRACING"] = "true"
@@ -80,6 +91,10 @@ except Exception as e:  # pragma: no cover - fallback when SDK missing
         def run_sync(*args: Any, **kwargs: Any) -> Any:
             raise _missing_agents_error() from e
 
+        @staticmethod
+        async def run(*args: Any, **kwargs: Any) -> Any:
+            raise _missing_agents_error() from e
+
     TContext = TypeVar("TContext")
 
     class RunContextWrapper(Generic[TContext]):  # type: ignore
@@ -179,15 +194,38 @@ def load_agent_config(config_path: Optional[Path]) -> AgentConfig:
 # ----------------------------------------------------------------------------
 # Utility: filesystem helpers
 # ----------------------------------------------------------------------------
+@functools.lru_cache(maxsize=32)
+def _resolve_base(base: str) -> Path:
+    # Tools resolve the same base dir for every file in a batch; realpath it once.
+    # Callers pass an absolute key, so a relative base can't go stale after chdir.
+    return Path(base).resolve()
+
+
+def _has_symlink_below(candidate: Path, base_resolved: Path) -> bool:
+    for parent in [candidate] + list(candidate.parents):
+        if parent == base_resolved:
+            return False
+        if os.path.islink(parent):
+            return True
+    return False
+
+
 def _resolve_safe(base: Path, target: str | Path) -> Path:
     """Resolve a target path relative to base while enforcing safety checks."""
 
-    base_resolved = base.resolve()
+    base_resolved = _resolve_base(os.path.abspath(base))
     target_path = Path(target)
 
     if target_path.is_absolute():
         raise ValueError(f"Absolute paths are not allowed: {target_path}")
 
+    if not target_path.drive and ".." not in target_path.parts:
+        # Without '..' or symlinks the joined path is already canonical, so the
+        # realpath walk in resolve() would return it unchanged
+        candidate = base_resolved / target_path
+        if not _has_symlink_below(candidate, base_resolved):
+            return candidate
+
     candidate = (base_resolved / target_path).resolve()
 
     try:
@@ -211,6 +249,68 @@ def _ensure_artifacts_dir(base: Path) -> Path:
     return ad
 
 
+def _fast_write_bytes(path: Path, data: bytes) -> None:
+    """Write bytes via a bare open/write/close chain, bypassing TextIOWrapper."""
+
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# Linux IOV_MAX; larger batches make os.writev fail with EINVAL
+_WRITEV_BATCH = 1024
+
+
+def _writev_all(fd: int, bufs: List[bytes]) -> int:
+    want = sum(map(len, bufs))
+    done = os.writev(fd, bufs) if hasattr(os, "writev") else 0
+    if done < want:
+        # Short write (or no writev on this platform): finish the remainder with plain writes
+        rest = memoryview(b"".join(bufs))[done:]
+        while rest:
+            rest = rest[os.write(fd, rest):]
+    return want
+
+
+def _fast_write_chunks(path: Path, chunks: Iterable[bytes]) -> int:
+    """Stream chunks to path, handing the kernel up to _WRITEV_BATCH buffers per syscall."""
+
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    total = 0
+    try:
+        batch: List[bytes] = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= _WRITEV_BATCH:
+                total += _writev_all(fd, batch)
+                batch = []
+        if batch:
+            total += _writev_all(fd, batch)
+    finally:
+        os.close(fd)
+    return total
+
+
+def _is_line_iterable(content: Any) -> bool:
+    """True for list-like content that _coerce_text_content would newline-join."""
+    return isinstance(content, Iterable) and not isinstance(content, (str, bytes, dict, set))
+
+
+def _iter_joined_bytes(items: Iterable[Any]) -> Iterator[bytes]:
+    """Yield the UTF-8 bytes of the newline-joined str(item) values, piece by piece."""
+
+    first = True
+    for item in items:
+        if not first:
+            yield b"\n"
+        first = False
+        yield str(item).encode("utf-8")
+
+
 def _enforce_allowed_extension(path: Path) -> None:
     config = get_active_agent_config()
     allowed = config.allowed_file_extensions
@@ -620,6 +720,11 @@ def _maybe_parse_structured_text(raw: Any) -> Any:
         text = raw.strip()
         if not text:
             return {}
+        if orjson is not None:
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                pass  # stdlib still accepts NaN/Infinity and >64-bit ints
         try:
             return json.loads(text)
         except json.JSONDecodeError:
@@ -670,6 +775,21 @@ def _coerce_text_content(content: Any) -> str:
         raise ValueError(f"Unsupported content type: {type(content)!r}") from exc
 
 
+def _file_item_from_payload(item: Any) -> FileItem:
+    """Build a FileItem, skipping pydantic validation for the common plain-dict shape."""
+
+    if isinstance(item, FileItem):
+        return item
+    if (
+        type(item) is dict
+        and len(item) == 2
+        and type(item.get("path")) is str
+        and type(item.get("content")) is str
+    ):
+        return FileItem.model_construct(path=item["path"], content=item["content"])
+    return FileItem.model_validate(item)
+
+
 def _normalize_file_map_input(files_input: Any) -> FileMap:
     """Accept several payload styles and convert them into FileMap."""
 
@@ -686,8 +806,8 @@ def _normalize_file_map_input(files_input: Any) -> FileMap:
     if isinstance(files_input, dict):
         # Allow either {"files": [...]} shape or {"path": "content"} mapping
         if "files" in files_input and isinstance(files_input["files"], list):
-            items = [FileItem.model_validate(item) for item in files_input["files"]]
-            return FileMap(files=items)
+            items = [_file_item_from_payload(item) for item in files_input["files"]]
+            return FileMap.model_construct(files=items)
         if all(isinstance(k, str) for k in files_input.keys()):
             if all(isinstance(v, (str, bytes)) for v in files_input.values()):
                 return build_file_map({k: _coerce_text_content(v) for k, v in files_input.items()})
@@ -697,10 +817,10 @@ def _normalize_file_map_input(files_input: Any) -> FileMap:
 
     if isinstance(files_input, Iterable):
         try:
-            items = [FileItem.model_validate(item) for item in files_input]
+            items = [_file_item_from_payload(item) for item in files_input]
         except Exception as exc:  # pragma: no cover - defensive
             raise ValueError(f"Invalid list format for files: {exc}") from exc
-        return FileMap(files=items)
+        return FileMap.model_construct(files=items)
 
     raise ValueError(f"Unsupported files payload type: {type(files_input)!r}")
 
@@ -717,20 +837,64 @@ def create_directory_impl(base_dir: Path, rel_path: str, dry_run: bool = False)
     return {"ok": True, "path": str(path), "created": True}
 
 
-def write_text_file_impl(base_dir: Path, rel_path: str, content: str, overwrite: bool = True, dry_run: bool = False) -> Dict[str, Any]:
-    """Core implementation for writing text files."""
+def write_text_file_impl(
+    base_dir: Path,
+    rel_path: str,
+    content: str | bytes | Iterable[Any],
+    overwrite: bool = True,
+    dry_run: bool = False,
+    skip_mkdir: bool = False,
+) -> Dict[str, Any]:
+    """Core implementation for writing text files.
+
+    ``skip_mkdir`` is set by batch writers that have already created every parent directory.
+    List-like ``content`` is written newline-joined, streamed without building the joined string.
+    """
     path = _resolve_safe(base_dir, rel_path)
     _enforce_allowed_extension(path)
-    if path.exists() and not overwrite:
+    if not overwrite and path.exists():  # only stat when the answer matters
         return {"ok": False, "error": "File exists and overwrite=False", "path": str(path)}
+    if _is_line_iterable(content):
+        chunks = _iter_joined_bytes(content)
+        if dry_run:
+            size = sum(map(len, chunks))
+            logging.info(f"[dry-run] Would write {size} bytes to: {path}")
+            return {"ok": True, "path": str(path), "bytes": size, "dry_run": True}
+        if not skip_mkdir:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        return {"ok": True, "path": str(path), "bytes": _fast_write_chunks(path, chunks)}
     if dry_run:
         logging.info(f"[dry-run] Would write {len(content)} bytes to: {path}")
         return {"ok": True, "path": str(path), "bytes": len(content), "dry_run": True}
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    if not skip_mkdir:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    # Pre-encoded content is written as-is; no TextIOWrapper/codec layer either way
+    _fast_write_bytes(path, content if isinstance(content, bytes) else content.encode("utf-8"))
     return {"ok": True, "path": str(path), "bytes": len(content)}
 
 
+def read_text_file_impl(base_dir: Path, rel_path: str, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Core implementation for reading UTF-8 text files with an optional size cap."""
+    path = _resolve_safe(base_dir, rel_path)
+    if not path.is_file():
+        return {"ok": False, "error": "File not found", "path": str(path)}
+    # Read at most max_bytes + 1 so oversized files are refused without loading them
+    with path.open("rb") as fh:
+        data = fh.read(max_bytes + 1) if max_bytes is not None else fh.read()
+    if max_bytes is not None and len(data) > max_bytes:
+        return {
+            "ok": False,
+            "error": f"File exceeds max_bytes={max_bytes}",
+            "path": str(path),
+            "bytes": path.stat().st_size,
+        }
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        return {"ok": False, "error": f"File is not valid UTF-8: {exc}", "path": str(path)}
+    return {"ok": True, "path": str(path), "content": content, "bytes": len(data)}
+
+
 def read_requirements_impl(requirements_path: Optional[Path]) -> Dict[str, Any]:
     """Core implementation for reading requirements."""
     if not requirements_path:
@@ -749,35 +913,111 @@ def read_requirements_impl(requirements_path: Optional[Path]) -> Dict[str, Any]:
 def write_many_impl(base_dir: Path, files: FileMap, overwrite: bool = True, dry_run: bool = False) -> Dict[str, Any]:
     """Core implementation for writing multiple files."""
     results = {}
-    for file_item in files.files:
+    # Last entry wins for duplicate paths, matching the old sequential loop
+    latest = {file_item.path: file_item for file_item in files.files}
+    if not latest:
+        return {"ok": True, "results": results}
+
+    parents_ready = False
+    if not dry_run:
+        # Create each unique parent once instead of once per file
+        parents: set[Path] = set()
+        for rel in latest:
+            try:
+                parents.add(_resolve_safe(base_dir, rel).parent)
+            except ValueError:
+                continue  # reported per file below
+        try:
+            # Deepest first: one mkdir(parents=True) also covers every ancestor,
+            # so directories already made along the way are skipped
+            created: set[Path] = set()
+            for parent in sorted(parents, key=lambda p: len(p.parts), reverse=True):
+                if parent in created:
+                    continue
+                parent.mkdir(parents=True, exist_ok=True)
+                created.add(parent)
+                created.update(parent.parents)
+            parents_ready = True
+        except OSError as exc:
+            logging.warning("Failed to pre-create parent directories: %s", exc)
+
+    def _write_one(rel: str, content: str) -> Dict[str, Any]:
         try:
             # Use the write_text_file_impl for consistent behavior
-            res = write_text_file_impl(base_dir, file_item.path, file_item.content, overwrite, dry_run)
-            results[file_item.path] = res
+            return write_text_file_impl(base_dir, rel, content, overwrite, dry_run, skip_mkdir=parents_ready)
         except Exception as e:
-            results[file_item.path] = {"ok": False, "error": str(e)}
+            return {"ok": False, "error": str(e)}
+
+    if dry_run:
+        # Nothing touches the disk; no point spinning up the pool
+        for rel, item in latest.items():
+            results[rel] = _write_one(rel, item.content)
+        return {"ok": True, "results": results}
+
+    # Writes are I/O-bound and release the GIL, so overlap them across threads
+    with ThreadPoolExecutor(max_workers=min(16, len(latest))) as executor:
+        futures = {rel: executor.submit(_write_one, rel, item.content) for rel, item in latest.items()}
+        for rel, future in futures.items():
+            results[rel] = future.result()
     return {"ok": True, "results": results}
 
 
+def _scan_tree(root: Path, include_dirs: bool) -> List[Dict[str, Any]]:
+    """Walk root with os.scandir; DirEntry reuses the dirent type, avoiding per-entry stat calls."""
+
+    matched: List[Dict[str, Any]] = []
+    stack: List[Tuple[str, str]] = [(str(root), "")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_symlink():
+                # Skip symlinks to maintain safety guarantees
+                continue
+            rel_path = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((entry.path, rel_path + "/"))
+                if include_dirs:
+                    matched.append({"path": rel_path, "is_dir": True})
+                continue
+            info: Dict[str, Any] = {"path": rel_path, "is_dir": False}
+            try:
+                info["size"] = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                info["size"] = None
+            matched.append(info)
+    return matched
+
+
 def list_files_impl(base_dir: Path, pattern: str = "**/*", include_dirs: bool = False) -> Dict[str, Any]:
     """List files relative to base_dir using glob patterns."""
 
     root = _resolve_safe(base_dir, ".")
+    if pattern == "**/*":
+        # Default "everything" pattern: a scandir walk is far cheaper than glob + stat per entry
+        return {"ok": True, "files": _scan_tree(root, include_dirs), "pattern": pattern}
+
     matched: List[Dict[str, Any]] = []
     for path in root.glob(pattern):
-        is_dir = path.is_dir()
-        if is_dir and not include_dirs:
-            continue
-        if path.is_symlink():
+        # One lstat answers is_symlink / is_dir / size (was up to three stat calls)
+        try:
+            st = os.lstat(path)
+        except OSError:
+            st = None
+        if st is not None and stat.S_ISLNK(st.st_mode):
             # Skip symlinks to maintain safety guarantees
             continue
+        is_dir = st is not None and stat.S_ISDIR(st.st_mode)
+        if is_dir and not include_dirs:
+            continue
         rel_path = path.relative_to(root).as_posix()
         info: Dict[str, Any] = {"path": rel_path, "is_dir": is_dir}
         if not is_dir:
-            try:
-                info["size"] = path.stat().st_size
-            except OSError:
-                info["size"] = None
+            info["size"] = st.st_size if st is not None else None
         matched.append(info)
     return {"ok": True, "files": matched, "pattern": pattern}
 
@@ -786,13 +1026,16 @@ def file_exists_impl(base_dir: Path, rel_path: str) -> Dict[str, Any]:
     """Check if a file or directory exists relative to base_dir."""
 
     path = _resolve_safe(base_dir, rel_path)
-    exists = path.exists()
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        mode = None
     return {
         "ok": True,
-        "exists": exists,
+        "exists": mode is not None,
         "path": str(path),
-        "is_file": path.is_file() if exists else False,
-        "is_dir": path.is_dir() if exists else False,
+        "is_file": mode is not None and stat.S_ISREG(mode),
+        "is_dir": mode is not None and stat.S_ISDIR(mode),
     }
 
 
@@ -822,15 +1065,52 @@ def run_linter_impl(
     }
 
 
+# Vendored/cached trees never hold the project's own sources
+_COMPILE_SKIP_DIRS = frozenset({"node_modules", ".git", "dist", ".venv", "__pycache__"})
+# Scaffolds usually hold just a few modules; a process pool only pays off above this
+_INLINE_COMPILE_MAX = 8
+
+
+def _iter_py_sources(base_dir: Path) -> List[str]:
+    """Iterative os.scandir walk for *.py files, pruning _COMPILE_SKIP_DIRS."""
+    sources: List[str] = []
+    stack = [str(base_dir)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _COMPILE_SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    sources.append(entry.path)
+    return sources
+
+
+def _compile_one(path: str) -> Optional[str]:
+    try:
+        py_compile.compile(path, doraise=True)
+    except (py_compile.PyCompileError, OSError) as e:
+        return str(e)
+    return None
+
+
 def py_compile_all_impl(base_dir: Path, dry_run: bool = False) -> Dict[str, Any]:
     """Core implementation for compiling Python files."""
     if dry_run:
         return {"ok": True, "compiled": True, "dry_run": True}
 
-    # compileall returns bool but we also surface per-file failures
-    compiled_ok = compileall.compile_dir(str(base_dir), quiet=1, force=False, maxlevels=10)
-    # simple pass/fail; detailed errors can be gleaned from stderr if run via py_compile
-    return {"ok": True, "compiled": bool(compiled_ok)}
+    sources = _iter_py_sources(base_dir)
+    if len(sources) <= _INLINE_COMPILE_MAX:
+        # Spawning a process pool costs far more than compiling a handful of files
+        errors = [msg for msg in map(_compile_one, sources) if msg]
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            errors = [msg for msg in ex.map(_compile_one, sources, chunksize=8) if msg]
+    return {"ok": True, "compiled": not errors, "errors": errors}
 
 
 def run_pytest_impl(base_dir: Path, args: List[str] | None = None, timeout_sec: int = 180, dry_run: bool = False) -> Dict[str, Any]:
@@ -851,6 +1131,29 @@ def run_pytest_impl(base_dir: Path, args: List[str] | None = None, timeout_sec:
     }
 
 
+async def run_pytest_impl_async(
+    base_dir: Path,
+    args: List[str] | None = None,
+    timeout_sec: int = 180,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Async variant of run_pytest_impl that does not block the event loop."""
+    if dry_run:
+        return {"ok": True, "pytest": "dry-run", "stdout": "", "stderr": ""}
+
+    cmd = [sys.executable, "-m", "pytest", "-q"]
+    if args:
+        cmd.extend(args)
+
+    code, out, err = await _run_subprocess_async(cmd, cwd=base_dir, timeout=timeout_sec)
+    return {
+        "ok": code == 0,
+        "returncode": code,
+        "stdout": out,
+        "stderr": err,
+    }
+
+
 def record_validation_impl(base_dir: Path, validation: ValidationResult, dry_run: bool = False) -> Dict[str, Any]:
     """Core implementation for recording validation results."""
     if dry_run:
@@ -858,7 +1161,10 @@ def record_validation_impl(base_dir: Path, validation: ValidationResult, dry_run
 
     artifacts_dir = _ensure_artifacts_dir(base_dir)
     path = artifacts_dir / "validation.json"
-    path.write_text(validation.model_dump_json(indent=2), encoding="utf-8")
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(validation.model_dump(), option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(validation.model_dump_json(indent=2), encoding="utf-8")
     return {"ok": True, "path": str(path)}
 
 
@@ -877,10 +1183,20 @@ def write_text_file(
     content: Any,
     overwrite: bool = True,
 ) -> Dict[str, Any]:
-    normalized = _coerce_text_content(content)
+    # List-like content is streamed by the impl rather than joined into one string here
+    normalized = content if _is_line_iterable(content) else _coerce_text_content(content)
     return write_text_file_impl(ctx.context.base_dir, rel_path, normalized, overwrite, ctx.context.dry_run)
 
 
+@function_tool(description_override="Read a UTF-8 text file relative to base_dir (refuses files larger than max_bytes).")
+def read_text_file(
+    ctx: RunContextWrapper[AgentContext],
+    rel_path: str,
+    max_bytes: Optional[int] = 200_000,
+) -> Dict[str, Any]:
+    return read_text_file_impl(ctx.context.base_dir, rel_path, max_bytes)
+
+
 @function_tool(description_override="Read and return a JSON object from requirements_path or a provided path.")
 def read_requirements(ctx: RunContextWrapper[AgentContext], rel_path: Optional[str] = None) -> Dict[str, Any]:
     req_path = Path(rel_path) if rel_path else ctx.context.requirements_path
@@ -888,13 +1204,15 @@ def read_requirements(ctx: RunContextWrapper[AgentContext], rel_path: Optional[s
 
 
 @function_tool(description_override="Create multiple files at once using structured input.")
-def write_many(
+async def write_many(
     ctx: RunContextWrapper[AgentContext],
     files: Any,
     overwrite: bool = True,
 ) -> Dict[str, Any]:
     file_map = _normalize_file_map_input(files)
-    return write_many_impl(ctx.context.base_dir, file_map, overwrite, ctx.context.dry_run)
+    return await asyncio.to_thread(
+        write_many_impl, ctx.context.base_dir, file_map, overwrite, ctx.context.dry_run
+    )
 
 
 @function_tool(description_override="List files relative to base_dir using glob patterns.")
@@ -912,17 +1230,17 @@ def file_exists(ctx: RunContextWrapper[AgentContext], rel_path: str) -> Dict[str
 
 
 @function_tool(description_override="Compile all Python files under base_dir to check syntax. Returns a report.")
-def py_compile_all(ctx: RunContextWrapper[AgentContext]) -> Dict[str, Any]:
-    return py_compile_all_impl(ctx.context.base_dir, ctx.context.dry_run)
+async def py_compile_all(ctx: RunContextWrapper[AgentContext]) -> Dict[str, Any]:
+    return await asyncio.to_thread(py_compile_all_impl, ctx.context.base_dir, ctx.context.dry_run)
 
 
 @function_tool(description_override="Run pytest -q inside base_dir (if available) with a safety timeout. Returns stdout/stderr.")
-def run_pytest(
+async def run_pytest(
     ctx: RunContextWrapper[AgentContext],
     args: List[str] | None = None,
     timeout_sec: int = 180,
 ) -> Dict[str, Any]:
-    return run_pytest_impl(ctx.context.base_dir, args, timeout_sec, ctx.context.dry_run)
+    return await run_pytest_impl_async(ctx.context.base_dir, args, timeout_sec, ctx.context.dry_run)
 
 
 @function_tool(description_override="Run a linter (e.g. flake8) inside base_dir and capture stdout/stderr.")
@@ -941,7 +1259,7 @@ def record_validation(ctx: RunContextWrapper[AgentContext], validation: Validati
 
 
 @function_tool(description_override="Lookup current best practices or SDK documentation snippets via the public web.")
-def web_search(
+async def web_search(
     ctx: RunContextWrapper[AgentContext],
     query: str,
     max_results: int = 5,
@@ -949,36 +1267,121 @@ def web_search(
 ) -> Dict[str, Any]:
     # The context is unused for now but kept for parity with other tools
     _ = ctx
-    return web_search_impl(query=query, max_results=max_results, region=region)
+    return await asyncio.to_thread(web_search_impl, query=query, max_results=max_results, region=region)
 
 
 # ----------------------------------------------------------------------------
 # Subprocess helper (used by run_pytest_impl)
 # ----------------------------------------------------------------------------
+# Only the tail of each stream is kept, so verbose runs use bounded memory
+SUBPROCESS_TAIL_LINES = 2048
+# Async readers pull fixed-size chunks, so no single output line can overrun them
+SUBPROCESS_READ_CHUNK = 1 << 16
+
+
+def _drain_stream(stream, tail: deque) -> None:
+    with stream:
+        for line in stream:
+            tail.append(line)
+
+
 def _run_subprocess(
     cmd: List[str],
     cwd: Path,
     timeout: int,
     env: Optional[Dict[str, str]] = None,
 ) -> Tuple[int, str, str]:
-    """Run a subprocess and capture output."""
+    """Run a subprocess and capture the last SUBPROCESS_TAIL_LINES lines of output."""
     proc = subprocess.Popen(
         cmd,
         cwd=str(cwd),
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
-        env={**os.environ, **(env or {})},
+        bufsize=1,
+        env={**os.environ, **env} if env else None,  # None: inherit without copying
     )
-    try:
-        out, err = proc.communicate(timeout=timeout)
-    except subprocess.TimeoutExpired:
+    out_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    err_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    readers = [
+        threading.Thread(target=_drain_stream, args=(proc.stdout, out_tail), daemon=True),
+        threading.Thread(target=_drain_stream, args=(proc.stderr, err_tail), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = threading.Event()
+
+    def _kill() -> None:
+        timed_out.set()
         proc.kill()
-        out, err = proc.communicate()
+
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+    try:
+        proc.wait()
+        for reader in readers:
+            reader.join()
+    finally:
+        timer.cancel()
+
+    out, err = "".join(out_tail), "".join(err_tail)
+    if timed_out.is_set():
         return 124, out, f"Timed out after {timeout}s\n{err}"
     return proc.returncode, out, err
 
 
+async def _drain_stream_async(stream: asyncio.StreamReader, tail: deque) -> None:
+    # Chunked reads: readline() raises once a single line outgrows the reader limit
+    pending = b""
+    while chunk := await stream.read(SUBPROCESS_READ_CHUNK):
+        *lines, pending = (pending + chunk).split(b"\n")
+        tail.extend(line.decode("utf-8", errors="replace") + "\n" for line in lines)
+    if pending:
+        tail.append(pending.decode("utf-8", errors="replace"))
+
+
+async def _run_subprocess_async(
+    cmd: List[str],
+    cwd: Path,
+    timeout: int,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[int, str, str]:
+    """Run a subprocess on the event loop and capture the tail of its output."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env={**os.environ, **env} if env else None,  # None: inherit without copying
+    )
+    out_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    err_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    timed_out = False
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _drain_stream_async(proc.stdout, out_tail),
+                _drain_stream_async(proc.stderr, err_tail),
+                proc.wait(),
+            ),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        timed_out = True
+    finally:
+        # Timeout, cancellation (aborted run) or a reader error: never orphan the child
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+    if timed_out:
+        return 124, "".join(out_tail), f"Timed out after {timeout}s\n{''.join(err_tail)}"
+    return proc.returncode, "".join(out_tail), "".join(err_tail)
+
+
 # ----------------------------------------------------------------------------
 # Web search helper
 # ----------------------------------------------------------------------------
@@ -1065,7 +1468,14 @@ def web_search_impl(query: str, max_results: int = 5, region: str = "us-en") ->
 # ----------------------------------------------------------------------------
 # Kimi client wiring (OpenAI-compatible) - COMPLETELY ISOLATED
 # ----------------------------------------------------------------------------
+_KIMI_CLIENT_CONFIGURED = False
+
+
 def _configure_kimi_client() -> None:
+    global _KIMI_CLIENT_CONFIGURED
+    if _KIMI_CLIENT_CONFIGURED:
+        return
+
     # First, clear any OpenAI environment variables that might interfere
     os.environ.pop("OPENAI_API_KEY", None)
     os.environ.pop("OPENAI_BASE_URL", None)
@@ -1086,17 +1496,23 @@ def _configure_kimi_client() -> None:
     set_default_openai_api("chat_completions")
 
     logging.info(f"Configured Kimi client with base URL: {base_url}")
+    _KIMI_CLIENT_CONFIGURED = True
 
 
 # ----------------------------------------------------------------------------
 # Agent & run logic
 # ----------------------------------------------------------------------------
 def build_agent(verbose: bool, config: Optional[AgentConfig] = None) -> Agent[AgentContext]:
+    active_config = config or get_active_agent_config()
+    return _cached_agent(verbose, active_config.model, active_config.temperature)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_agent(verbose: bool, model: str, temperature: float) -> Agent[AgentContext]:
+    """Build the agent once per (verbose, model, temperature) combination."""
     if verbose:
         enable_verbose_stdout_logging()
 
-    active_config = config or get_active_agent_config()
-
     instructions = """
     You are a coding agent that SCAFFOLDS REAL PROJECTS ON DISK using provided tools only.
 
@@ -1149,6 +1565,7 @@ def build_agent(verbose: bool, config: Optional[AgentConfig] = None) -> Agent[Ag
     tools = [
         create_directory,
         write_text_file,
+        read_text_file,
         read_requirements,
         write_many,
         list_files,
@@ -1164,8 +1581,8 @@ def build_agent(verbose: bool, config: Optional[AgentConfig] = None) -> Agent[Ag
         name="Kimi Coding Agent",
         instructions=instructions,
         tools=tools,
-        model=active_config.model,
-        model_settings=ModelSettings(temperature=active_config.temperature),
+        model=model,
+        model_settings=ModelSettings(temperature=temperature),
     )
     return agent
 
@@ -1180,26 +1597,20 @@ def bootstrap_project(base_dir: Path, requirements_path: Optional[Path]) -> None
     (base_dir / "src").mkdir(parents=True, exist_ok=True)
     (base_dir / "tests").mkdir(parents=True, exist_ok=True)
 
-    # write the starter files
-    (base_dir / "README.md").write_text(
-        "# Project\n\nGenerated by bootstrap.\n\n## Tests\n\n```bash\npython -m pytest -q\n```\n",
-        encoding="utf-8",
-    )
+    # write the starter files (pre-encoded; raw os.write, no text-layer setup per file)
     (base_dir / "src" / "__init__.py").touch()
-    (base_dir / "src" / "app.py").write_text(
-        "def add(a, b):\n    return a + b\n\nif __name__ == '__main__':\n    print('hello from bootstrap')\n",
-        encoding="utf-8",
-    )
-    (base_dir / "tests" / "test_smoke.py").write_text(
-        "from src.app import add\n\ndef test_add():\n    assert add(1, 2) == 3\n",
-        encoding="utf-8",
-    )
-    (base_dir / ".gitignore").write_text("__pycache__/\n.env\n", encoding="utf-8")
-    (base_dir / "pyproject.toml").write_text(
-        '[build-system]\nrequires = ["setuptools", "wheel"]\n'
-        '[tool.pytest.ini_options]\npythonpath = ["."]\n',
-        encoding="utf-8",
-    )
+    starter_files = {
+        "README.md": b"# Project\n\nGenerated by bootstrap.\n\n## Tests\n\n```bash\npython -m pytest -q\n```\n",
+        "src/app.py": b"def add(a, b):\n    return a + b\n\nif __name__ == '__main__':\n    print('hello from bootstrap')\n",
+        "tests/test_smoke.py": b"from src.app import add\n\ndef test_add():\n    assert add(1, 2) == 3\n",
+        ".gitignore": b"__pycache__/\n.env\n",
+        "pyproject.toml": (
+            b'[build-system]\nrequires = ["setuptools", "wheel"]\n'
+            b'[tool.pytest.ini_options]\npythonpath = ["."]\n'
+        ),
+    }
+    for rel, data in starter_files.items():
+        _fast_write_bytes(base_dir / rel, data)
 
 
 # ----------------------------------------------------------------------------
@@ -1350,12 +1761,14 @@ def main():
     if research_summary:
         prompt_input = f"{args.prompt}\n\n# Research Notes\n{research_summary}"
 
-    # Kick off a single run
-    result = Runner.run_sync(
-        agent,
-        input=prompt_input,
-        context=ctx,
-        max_turns=agent_config.max_turns,
+    # Kick off a single run; the async runner lets tool I/O overlap with model calls
+    result = asyncio.run(
+        Runner.run(
+            agent,
+            input=prompt_input,
+            context=ctx,
+            max_turns=agent_config.max_turns,
+        )
     )
 
     print("\n==== FINAL OUTPUT ====\n")
@@ -23,17 +23,37 @@ Important:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import logging
 import os
 import sys
+import shutil
+import stat
 import subprocess
-import compileall
+import tempfile
+import threading
+import zipfile
+import functools
+import importlib.util
+import py_compile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+
+try:  # optional C-accelerated JSON; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # POSIX only; used to grow subprocess pipe buffers on Linux
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 
 # Disable OpenAI tracing and other external services
 os.environ["OPENAI_AGENTS_TRACING"] = "false"
@@ -51,7 +71,8 @@ try:
         ModelSettings,
     )
     from agents.run_context import RunContextWrapper
-    from openai import AsyncOpenAI
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+    import httpx  # installed with openai
 except Exception as e:
     raise RuntimeError(
         "The OpenAI Agents SDK and openai client are required. "
@@ -67,18 +88,106 @@ class AgentContext:
     base_dir: Path
     requirements_path: Optional[Path] = None
     dry_run: bool = False  # if True, tools won't write, just log
+    requirements_cache: Optional[Dict[str, Any]] = None  # already-parsed requirements_path
 
 
 # ----------------------------------------------------------------------------
 # Utility: filesystem helpers
 # ----------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=32)
+def _resolve_base(base: str) -> str:
+    # Keyed on an absolute path, so a relative base can't go stale after chdir
+    return str(Path(base).resolve())
+
+
 def _resolve_safe(base: Path, target: str | Path) -> Path:
-    base = base.resolve()
-    p = (base / target).resolve()
-    if not str(p).startswith(str(base)):
+    # Only the base is memoized. The child is resolved on every call: a symlink
+    # created later (by agent-run code or another write) must not slip past a
+    # containment answer cached before it existed.
+    base_str = _resolve_base(os.path.abspath(base))
+    p = str((Path(base_str) / target).resolve())
+    try:
+        inside = os.path.commonpath([base_str, p]) == base_str
+    except ValueError:  # e.g. different drives on Windows
+        inside = False
+    if not inside:
         raise ValueError(f"Refusing to write outside base_dir: {p}")
-    return p
+    return Path(p)
+
+
+def _fast_write_bytes(path: str | Path, data: bytes) -> None:
+    """Write pre-encoded bytes with raw os.open/os.write, preallocating on POSIX."""
+    if os.name == "nt":
+        Path(path).write_bytes(data)
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if data and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, len(data))
+            except OSError:
+                pass  # filesystem doesn't support preallocation
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# Larger payloads are written to a sibling temp file and renamed into place, so a
+# crashed run never leaves a half-written file behind (small files are one write())
+ATOMIC_WRITE_MIN_BYTES = 16 * 1024
+
+# os.umask() can only be read by setting it, so read it once at import rather than
+# racing other writer threads; new files get what _fast_write_bytes' os.open would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _replacement_mode(path: Path) -> int:
+    """Mode for a file about to replace *path*: keep the existing one (e.g. an exec bit)."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o644 & ~_UMASK
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    # mkstemp gives each writer its own tmp file; tool calls run on worker threads,
+    # so a pid-only name would be shared by concurrent writes to the same path
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, _replacement_mode(path))  # mkstemp creates 0600
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _is_safe_relpath(rel: str) -> bool:
+    norm = rel.replace("\\", "/")
+    return not (
+        not norm or norm.startswith("/") or os.path.isabs(rel) or norm[1:2] == ":"
+        or ".." in norm.split("/")
+    )
+
+
+def _validate_relpaths(rels) -> None:
+    """Single up-front check that every path stays relative and below its base."""
+    for rel in rels:
+        if not _is_safe_relpath(rel):
+            raise ValueError(f"Refusing to write outside base_dir: {rel}")
 
 
 def _ensure_artifacts_dir(base: Path) -> Path:
@@ -113,6 +222,10 @@ class ValidationResult(BaseModel):
     pytest_stderr: str = ""
 
 
+# Built once; dump_json emits bytes directly (no str round-trip before writing)
+_VALIDATION_ADAPTER = TypeAdapter(ValidationResult)
+
+
 def build_file_map(files: dict[str, str]) -> FileMap:
     """Convert plain dict into the FileMap schema the SDK requires."""
     return FileMap(files=[FileItem(path=k, content=v) for k, v in files.items()])
@@ -131,160 +244,433 @@ def create_directory_impl(base_dir: Path, rel_path: str, dry_run: bool = False)
     return {"ok": True, "path": str(path), "created": True}
 
 
-def write_text_file_impl(base_dir: Path, rel_path: str, content: str, overwrite: bool = True, dry_run: bool = False) -> Dict[str, Any]:
+def write_text_file_impl(
+    base_dir: Path,
+    rel_path: str,
+    content: str | bytes,
+    overwrite: bool = True,
+    dry_run: bool = False,
+    skip_mkdir: bool = False,
+) -> Dict[str, Any]:
     path = _resolve_safe(base_dir, rel_path)
-    if path.exists() and not overwrite:
+    if not overwrite and path.exists():  # only stat when the answer matters
         return {"ok": False, "error": "File exists and overwrite=False", "path": str(path)}
     if dry_run:
         logging.info(f"[dry-run] Would write {len(content)} bytes to: {path}")
         return {"ok": True, "path": str(path), "bytes": len(content), "dry_run": True}
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    if not skip_mkdir:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    # Pre-encoded content (e.g. static templates) is written as-is
+    data = content if isinstance(content, bytes) else content.encode("utf-8")
+    if len(data) > ATOMIC_WRITE_MIN_BYTES:
+        _atomic_write_bytes(path, data)
+    else:
+        _fast_write_bytes(path, data)
     return {"ok": True, "path": str(path), "bytes": len(content)}
 
 
-def read_requirements_impl(requirements_path: Optional[Path]) -> Dict[str, Any]:
+def read_requirements_impl(
+    requirements_path: Optional[Path],
+    parsed: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
     if not requirements_path:
         return {"ok": False, "error": "No requirements path provided"}
+    if parsed is not None:
+        # Caller already read and parsed this file (e.g. main() before starting the agent)
+        return {"ok": True, "requirements": parsed, "path": str(requirements_path)}
     if not requirements_path.exists():
         return {"ok": False, "error": f"Requirements file not found: {requirements_path}"}
     try:
-        data = json.loads(requirements_path.read_text(encoding="utf-8"))
+        if orjson is not None:
+            data = orjson.loads(requirements_path.read_bytes())
+        else:
+            data = json.loads(requirements_path.read_text(encoding="utf-8"))
         return {"ok": True, "requirements": data, "path": str(requirements_path)}
     except Exception as e:
         return {"ok": False, "error": f"Failed to parse JSON: {e}", "path": str(requirements_path)}
 
 
 def write_many_impl(base_dir: Path, files: FileMap, overwrite: bool = True, dry_run: bool = False) -> Dict[str, Any]:
-    results = {}
-    for file_item in files.files:
+    results: Dict[str, Any] = {}
+    # Last entry wins for duplicate paths, matching the old sequential loop
+    latest = {file_item.path: file_item for file_item in files.files}
+    if not latest:
+        return {"ok": True, "results": results}
+
+    parents_ready = False
+    if not dry_run:
+        # Create each unique parent once so the workers only write
+        parents = set()
+        for rel in latest:
+            try:
+                parents.add(_resolve_safe(base_dir, rel).parent)
+            except ValueError:
+                continue  # reported per file below
         try:
-            res = write_text_file_impl(base_dir, file_item.path, file_item.content, overwrite, dry_run)
-            results[file_item.path] = res
-        except Exception as e:
-            results[file_item.path] = {"ok": False, "error": str(e)}
+            # Shallowest first: every mkdir then finds its own parent already present
+            for parent in sorted(parents, key=lambda p: len(p.parts)):
+                parent.mkdir(parents=True, exist_ok=True)
+            parents_ready = True
+        except OSError as e:
+            logging.warning(f"Failed to pre-create parent directories: {e}")
+
+    with ThreadPoolExecutor(max_workers=min(16, len(latest))) as ex:
+        futures = {
+            rel: ex.submit(write_text_file_impl, base_dir, rel, item.content, overwrite, dry_run, parents_ready)
+            for rel, item in latest.items()
+        }
+        for rel, future in futures.items():
+            try:
+                results[rel] = future.result()
+            except Exception as e:
+                results[rel] = {"ok": False, "error": str(e)}
     return {"ok": True, "results": results}
 
 
+# Vendored/generated trees never hold the project's own sources
+_SKIP_DIRS = frozenset({"node_modules", ".git", "dist", ".venv", "__pycache__"})
+
+
+def _iter_py_sources(base_dir: Path) -> List[str]:
+    """Iterative os.scandir walk for *.py files, pruning _SKIP_DIRS."""
+    sources: List[str] = []
+    stack = [str(base_dir)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    sources.append(entry.path)
+    return sources
+
+
+# Scaffolds usually hold just utils.py plus a couple of tests
+_INLINE_COMPILE_MAX = 8
+
+
+def _compile_one(path: str) -> Optional[str]:
+    try:
+        py_compile.compile(path, doraise=True)
+    except (py_compile.PyCompileError, OSError) as e:
+        return str(e)
+    return None
+
+
 def py_compile_all_impl(base_dir: Path, dry_run: bool = False) -> Dict[str, Any]:
     if dry_run:
         return {"ok": True, "compiled": True, "dry_run": True}
-    compiled_ok = compileall.compile_dir(str(base_dir), quiet=1, force=False, maxlevels=10)
-    return {"ok": True, "compiled": bool(compiled_ok)}
+    # One file per task across all cores; compiling is pure CPU work with no shared state
+    sources = _iter_py_sources(base_dir)
+    if not sources:
+        return {"ok": True, "compiled": True, "errors": []}
+    if len(sources) <= _INLINE_COMPILE_MAX:
+        # Spawning a process pool costs far more than compiling a handful of files
+        errors = [msg for msg in map(_compile_one, sources) if msg]
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            errors = [msg for msg in ex.map(_compile_one, sources, chunksize=8) if msg]
+    return {"ok": True, "compiled": not errors, "errors": errors}
+
+
+@functools.lru_cache(maxsize=1)
+def _pytest_base_cmd() -> Tuple[str, ...]:
+    # No .pytest_cache reads/writes and no header in the captured output
+    cmd = [sys.executable, "-m", "pytest", "-q", "--no-header", "-p", "no:cacheprovider"]
+    # pytest runs in this same interpreter, so probing for xdist here is exact and
+    # avoids spawning a run only to fail with a usage error
+    if importlib.util.find_spec("xdist") is not None:
+        cmd += ["-n", "auto"]
+    return tuple(cmd)
 
 
 def run_pytest_impl(base_dir: Path, args: List[str] | None = None, timeout_sec: int = 180, dry_run: bool = False) -> Dict[str, Any]:
     if dry_run:
         return {"ok": True, "pytest": "dry-run", "stdout": "", "stderr": ""}
-    cmd = [sys.executable, "-m", "pytest", "-q"]
-    if args:
-        cmd.extend(args)
+    cmd = [*_pytest_base_cmd(), *(args or [])]
     code, out, err = _run_subprocess(cmd, cwd=base_dir, timeout=timeout_sec)
     return {"ok": code == 0, "returncode": code, "stdout": out, "stderr": err}
 
 
+async def run_pytest_impl_async(base_dir: Path, args: List[str] | None = None, timeout_sec: int = 180, dry_run: bool = False) -> Dict[str, Any]:
+    if dry_run:
+        return {"ok": True, "pytest": "dry-run", "stdout": "", "stderr": ""}
+    cmd = [*_pytest_base_cmd(), *(args or [])]
+    code, out, err = await _run_subprocess_async(cmd, cwd=base_dir, timeout=timeout_sec)
+    return {"ok": code == 0, "returncode": code, "stdout": out, "stderr": err}
+
+
 def record_validation_impl(base_dir: Path, validation: ValidationResult, dry_run: bool = False) -> Dict[str, Any]:
     if dry_run:
         return {"ok": True, "dry_run": True}
     artifacts_dir = _ensure_artifacts_dir(base_dir)
     path = artifacts_dir / "validation.json"
-    path.write_text(validation.model_dump_json(indent=2), encoding="utf-8")
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(validation.model_dump(), option=orjson.OPT_INDENT_2))
+    else:
+        path.write_bytes(_VALIDATION_ADAPTER.dump_json(validation, indent=2))
     return {"ok": True, "path": str(path)}
 
 
 # ----------------------------------------------------------------------------
 # Function tools (wrappers around core implementations)
 # ----------------------------------------------------------------------------
+# Tools are async so blocking filesystem/subprocess work runs off the event loop
+# and the Runner can overlap it with other tool calls and model streaming.
 @function_tool(description_override="Create a directory relative to base_dir if it does not exist.")
-def create_directory(ctx: RunContextWrapper[AgentContext], rel_path: str) -> Dict[str, Any]:
-    return create_directory_impl(ctx.context.base_dir, rel_path, ctx.context.dry_run)
+async def create_directory(ctx: RunContextWrapper[AgentContext], rel_path: str) -> Dict[str, Any]:
+    return await asyncio.to_thread(create_directory_impl, ctx.context.base_dir, rel_path, ctx.context.dry_run)
 
 
 @function_tool(description_override="Write text to a file (UTF-8). Creates parent folders if needed.")
-def write_text_file(ctx: RunContextWrapper[AgentContext], rel_path: str, content: str, overwrite: bool = True) -> Dict[str, Any]:
-    return write_text_file_impl(ctx.context.base_dir, rel_path, content, overwrite, ctx.context.dry_run)
+async def write_text_file(ctx: RunContextWrapper[AgentContext], rel_path: str, content: str, overwrite: bool = True) -> Dict[str, Any]:
+    return await asyncio.to_thread(
+        write_text_file_impl, ctx.context.base_dir, rel_path, content, overwrite, ctx.context.dry_run
+    )
 
 
 @function_tool(description_override="Read and return a JSON object from requirements_path or a provided path.")
-def read_requirements(ctx: RunContextWrapper[AgentContext], rel_path: Optional[str] = None) -> Dict[str, Any]:
+async def read_requirements(ctx: RunContextWrapper[AgentContext], rel_path: Optional[str] = None) -> Dict[str, Any]:
     req_path = Path(rel_path) if rel_path else ctx.context.requirements_path
-    return read_requirements_impl(req_path)
+    if ctx.context.requirements_cache is not None and req_path == ctx.context.requirements_path:
+        return read_requirements_impl(req_path, ctx.context.requirements_cache)
+    return await asyncio.to_thread(read_requirements_impl, req_path)
 
 
 @function_tool(description_override="Create multiple files at once using structured input.")
-def write_many(
+async def write_many(
     ctx: RunContextWrapper[AgentContext],
     files: FileMap,
     overwrite: bool = True,
 ) -> Dict[str, Any]:
-    return write_many_impl(ctx.context.base_dir, files, overwrite, ctx.context.dry_run)
+    # write_many_impl already fans out over its own thread pool
+    return await asyncio.to_thread(write_many_impl, ctx.context.base_dir, files, overwrite, ctx.context.dry_run)
 
 
 @function_tool(description_override="Compile all Python files under base_dir to check syntax. Returns a report.")
-def py_compile_all(ctx: RunContextWrapper[AgentContext]) -> Dict[str, Any]:
-    return py_compile_all_impl(ctx.context.base_dir, ctx.context.dry_run)
+async def py_compile_all(ctx: RunContextWrapper[AgentContext]) -> Dict[str, Any]:
+    return await asyncio.to_thread(py_compile_all_impl, ctx.context.base_dir, ctx.context.dry_run)
 
 
 @function_tool(description_override="Run pytest -q inside base_dir (if available) with a safety timeout. Returns stdout/stderr.")
-def run_pytest(
+async def run_pytest(
     ctx: RunContextWrapper[AgentContext],
     args: List[str] | None = None,
     timeout_sec: int = 180,
 ) -> Dict[str, Any]:
-    return run_pytest_impl(ctx.context.base_dir, args, timeout_sec, ctx.context.dry_run)
+    return await run_pytest_impl_async(ctx.context.base_dir, args, timeout_sec, ctx.context.dry_run)
 
 
 @function_tool(description_override="Persist a JSON validation summary to artifacts/validation.json for auditing.")
-def record_validation(ctx: RunContextWrapper[AgentContext], validation: ValidationResult) -> Dict[str, Any]:
-    return record_validation_impl(ctx.context.base_dir, validation, ctx.context.dry_run)
+async def record_validation(ctx: RunContextWrapper[AgentContext], validation: ValidationResult) -> Dict[str, Any]:
+    return await asyncio.to_thread(record_validation_impl, ctx.context.base_dir, validation, ctx.context.dry_run)
 
 
 # ----------------------------------------------------------------------------
 # Subprocess helper (used by run_pytest_impl)
 # ----------------------------------------------------------------------------
+# Only the tail of each stream is kept so chatty commands (npm install, verbose
+# pytest) use bounded memory.
+SUBPROCESS_TAIL_LINES = 4096
+# Reader-side buffer for child pipes (default is 8 KiB), and the kernel pipe size
+# requested on Linux so chatty children can write bursts without blocking
+SUBPROCESS_READ_BUFSIZE = 1 << 16
+SUBPROCESS_PIPE_SIZE = 1 << 20
+
+
+def _subprocess_env(extra: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+    # None lets the child inherit our environment directly (no dict or envp build);
+    # overrides layer onto the live os.environ so later changes (PATH, VIRTUAL_ENV) apply
+    if not extra:
+        return None
+    return {**os.environ, **extra}
+
+
+@functools.lru_cache(maxsize=16)
+def _which(name: str) -> Optional[str]:
+    return shutil.which(name)
+
+
+def _resolve_cmd(cmd: List[str]) -> List[str]:
+    # shutil.which walks PATH and stats candidates; resolve each executable once
+    return [_which(cmd[0]) or cmd[0], *cmd[1:]]
+
+
+def _grow_pipe(stream) -> None:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return
+    try:
+        fcntl.fcntl(stream.fileno(), getattr(fcntl, "F_SETPIPE_SZ", 1031), SUBPROCESS_PIPE_SIZE)
+    except OSError:
+        pass  # capped by /proc/sys/fs/pipe-max-size; keep the default size
+
+
+def _drain_stream(stream, tail: deque, forward=None) -> None:
+    with stream:
+        for line in stream:
+            tail.append(line)
+            if forward is not None:
+                forward.write(line)
+                forward.flush()
+
 
 def _run_subprocess(
     cmd: List[str],
     cwd: Path,
     timeout: int,
     env: Optional[Dict[str, str]] = None,
+    stream_output: bool = False,
 ) -> Tuple[int, str, str]:
+    """Run cmd, keeping only the last SUBPROCESS_TAIL_LINES lines of each stream.
+
+    With stream_output=True lines are also echoed to our stdout/stderr as they arrive.
+    """
     proc = subprocess.Popen(
-        cmd,
+        _resolve_cmd(cmd),
         cwd=str(cwd),
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
-        env={**os.environ, **(env or {})},
+        bufsize=SUBPROCESS_READ_BUFSIZE,
+        env=_subprocess_env(env),
     )
-    try:
-        out, err = proc.communicate(timeout=timeout)
-    except subprocess.TimeoutExpired:
+    _grow_pipe(proc.stdout)
+    _grow_pipe(proc.stderr)
+    out_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    err_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    readers = [
+        threading.Thread(
+            target=_drain_stream, args=(proc.stdout, out_tail, sys.stdout if stream_output else None), daemon=True
+        ),
+        threading.Thread(
+            target=_drain_stream, args=(proc.stderr, err_tail, sys.stderr if stream_output else None), daemon=True
+        ),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = threading.Event()
+
+    def _kill() -> None:
+        timed_out.set()
         proc.kill()
-        out, err = proc.communicate()
+
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+    try:
+        proc.wait()
+        for reader in readers:
+            reader.join()
+    finally:
+        timer.cancel()
+
+    out, err = "".join(out_tail), "".join(err_tail)
+    if timed_out.is_set():
         return 124, out, f"Timed out after {timeout}s\n{err}"
     return proc.returncode, out, err
 
 
+async def _drain_stream_async(stream: asyncio.StreamReader, tail: deque) -> None:
+    # Chunked reads: readline() raises once a single line outgrows the reader limit
+    pending = b""
+    while chunk := await stream.read(SUBPROCESS_READ_BUFSIZE):
+        *lines, pending = (pending + chunk).split(b"\n")
+        tail.extend(line.decode("utf-8", errors="replace") + "\n" for line in lines)
+    if pending:
+        tail.append(pending.decode("utf-8", errors="replace"))
+
+
+async def _run_subprocess_async(
+    cmd: List[str],
+    cwd: Path,
+    timeout: int,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[int, str, str]:
+    proc = await asyncio.create_subprocess_exec(
+        *_resolve_cmd(cmd),
+        cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_subprocess_env(env),
+    )
+    out_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    err_tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    timed_out = False
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _drain_stream_async(proc.stdout, out_tail),
+                _drain_stream_async(proc.stderr, err_tail),
+                proc.wait(),
+            ),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        timed_out = True
+    finally:
+        # Timeout, cancellation (aborted run) or a reader error: never orphan the child
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+    if timed_out:
+        return 124, "".join(out_tail), f"Timed out after {timeout}s\n{''.join(err_tail)}"
+    return proc.returncode, "".join(out_tail), "".join(err_tail)
+
+
 # ----------------------------------------------------------------------------
 # Kimi client wiring (OpenAI-compatible) - COMPLETELY ISOLATED
 # ----------------------------------------------------------------------------
+# The openai client already retries with capped exponential backoff + jitter and
+# honors Retry-After on 429s; keep the retry budget small and cap in-flight requests
+# so a throttled burst fails fast instead of queueing for minutes.
+KIMI_MAX_RETRIES = 3
+KIMI_MAX_CONCURRENCY = 8
 
-def _configure_kimi_client() -> None:
-    # Clear OpenAI env that might interfere
-    os.environ.pop("OPENAI_API_KEY", None)
-    os.environ.pop("OPENAI_BASE_URL", None)
-
-    api_key = os.getenv("KIMI_API_KEY") or os.getenv("MOONSHOT_API_KEY")
-    if not api_key:
-        raise RuntimeError("Missing KIMI_API_KEY (or MOONSHOT_API_KEY).")
+_KIMI_CLIENT: Optional[AsyncOpenAI] = None
+_KIMI_CLIENT_LOCK = threading.Lock()
 
-    base_url = os.getenv("KIMI_API_BASE") or os.getenv("MOONSHOT_API_BASE") or "https://api.moonshot.ai/v1"
 
-    client = AsyncOpenAI(base_url=base_url, api_key=api_key)
-    set_default_openai_client(client)
-    # Keep Chat Completions for Kimi compatibility; Responses is also supported by OpenAI proper.
-    set_default_openai_api("chat_completions")
+def _configure_kimi_client() -> None:
+    global _KIMI_CLIENT
+    with _KIMI_CLIENT_LOCK:
+        if _KIMI_CLIENT is not None:
+            return  # already wired; repeated calls (common in tests) are no-ops
+
+        # Clear OpenAI env that might interfere
+        os.environ.pop("OPENAI_API_KEY", None)
+        os.environ.pop("OPENAI_BASE_URL", None)
+
+        api_key = os.getenv("KIMI_API_KEY") or os.getenv("MOONSHOT_API_KEY")
+        if not api_key:
+            raise RuntimeError("Missing KIMI_API_KEY (or MOONSHOT_API_KEY).")
+
+        base_url = os.getenv("KIMI_API_BASE") or os.getenv("MOONSHOT_API_BASE") or "https://api.moonshot.ai/v1"
+
+        # One shared connection pool for the whole process; the openai wrapper keeps
+        # its default timeout and redirect settings, only the pool limits change
+        client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            max_retries=KIMI_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=KIMI_MAX_CONCURRENCY,
+                    max_keepalive_connections=KIMI_MAX_CONCURRENCY,
+                ),
+            ),
+        )
+        set_default_openai_client(client)
+        # Keep Chat Completions for Kimi compatibility; Responses is also supported by OpenAI proper.
+        set_default_openai_api("chat_completions")
+        _KIMI_CLIENT = client
 
     logging.info(f"Configured Kimi client with base URL: {base_url}")
 
@@ -302,52 +688,268 @@ def _get(d: Dict[str, Any], *path: str, default=None):
     return cur
 
 
+_EMPTY: Dict[str, Any] = {}
+_TS_KEYS = ("typescript", "tsx", "ts")
+
+
+def _section(d: Dict[str, Any], key: str) -> Dict[str, Any]:
+    # Single-level _get for the hot planner predicates; tolerates malformed sections
+    v = d.get(key)
+    return v if isinstance(v, dict) else _EMPTY
+
+
 def is_spa(req: Dict[str, Any]) -> bool:
-    t = str(_get(req, "project", "type", default="")).lower()
-    pat = str(_get(req, "specifications", "architecture", "pattern", default="")).lower()
-    if "single-page" in t or "single-page" in pat or "spa" in pat:
+    arch = _section(_section(req, "specifications"), "architecture")
+    pat = str(arch.get("pattern") or "").lower()
+    if "single-page" in pat or "spa" in pat:
+        return True
+    t = str(_section(req, "project").get("type") or "").lower()
+    if "single-page" in t:
         return True
-    services = _get(req, "specifications", "architecture", "services", default=[]) or []
+    services = arch.get("services") or []
     return any(str(s).lower() == "frontend" for s in services)
 
 
 def wants_typescript(req: Dict[str, Any]) -> bool:
-    fr = _get(req, "specifications", "technical_requirements", "frontend", default=[]) or []
+    fr = _section(_section(req, "specifications"), "technical_requirements").get("frontend") or []
     joined = " ".join(fr).lower()
-    return any(k in joined for k in ("typescript", "tsx", "ts"))
+    return any(k in joined for k in _TS_KEYS)
+
+
+# Defaults (respect sample's 18.x / 3.x / 6.x)
+_DEFAULT_PKG_VERSIONS: Dict[str, str] = {
+    "react": "^18.2.0",
+    "react-dom": "^18.2.0",
+    "vite": "^7.1.0",
+    "@vitejs/plugin-react": "^5.0.0",
+    "tailwindcss": "^3.4.18",
+    "postcss": "^8.4.0",
+    "autoprefixer": "^10.4.0",
+    "dexie": "^3.2.4",
+    "@dnd-kit/core": "^6.0.0",
+    "@types/react": "^18.2.0",
+    "@types/react-dom": "^18.2.0",
+}
 
 
 def infer_pkg_versions(req: Dict[str, Any]) -> Dict[str, str]:
     """Honor version majors in requirements; default to conservative semver ranges."""
     frontend: List[str] = (_get(req, "specifications", "technical_requirements", "frontend", default=[]) or [])
-    out: Dict[str, str] = {}
-    # Defaults (respect sample's 18.x / 3.x / 6.x)
-    out.setdefault("react", "^18.2.0")
-    out.setdefault("react-dom", "^18.2.0")
-    out.setdefault("vite", "^7.1.0")
-    out.setdefault("@vitejs/plugin-react", "^5.0.0")
-    out.setdefault("tailwindcss", "^3.4.18")
-    out.setdefault("postcss", "^8.4.0")
-    out.setdefault("autoprefixer", "^10.4.0")
-    out.setdefault("dexie", "^3.2.4")
-    out.setdefault("@dnd-kit/core", "^6.0.0")
-    out.setdefault("@types/react", "^18.2.0")
-    out.setdefault("@types/react-dom", "^18.2.0")
+    out: Dict[str, str] = _DEFAULT_PKG_VERSIONS.copy()
     return out
 
 
+# ----------------------------------------------------------------------------
+# Static SPA templates — identical on every plan, so built once at import
+# ----------------------------------------------------------------------------
+
+# vite config (JS to keep it simple)
+_VITE_CONFIG_JS = (
+    "import { defineConfig } from 'vite'\n"
+    "import react from '@vitejs/plugin-react'\n\n"
+    "// https://vite.dev/config/\n"
+    "export default defineConfig({ plugins: [react()], server: { port: 5173 } })\n"
+)
+
+# index.html is the only templated page; it is spliced from these fixed segments
+# around the project name and entry script (no format-string parsing per plan).
+_INDEX_HTML_HEAD = (
+    "<!doctype html>\n<html lang=\"en\">\n  <head>\n    <meta charset=\"UTF-8\" />\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\" />\n    <title>"
+)
+_INDEX_HTML_MID = (
+    "</title>\n  </head>\n"
+    "  <body class=\"bg-gray-50 text-slate-900\">\n    <div id=\"root\"></div>\n    <script type=\"module\" src=\""
+)
+_INDEX_HTML_TAIL = "\"></script>\n  </body>\n</html>\n"
+
+_POSTCSS_CONFIG = (
+    "export default {\n  plugins: {\n    tailwindcss: {},\n    autoprefixer: {},\n  },\n}\n"
+)
+
+_TAILWIND_CONFIG = (
+    "/** @type {import('tailwindcss').Config} */\nexport default {\n  content: [\n    './index.html',\n    './src/**/*.{js,jsx,ts,tsx}',\n  ],\n  theme: { extend: {} },\n  plugins: [],\n}\n"
+)
+
+_INDEX_CSS = (
+    "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n\n"
+    "/* App-level tweaks */\n#root { min-height: 100vh; }\n"
+)
+
+_TSCONFIG_JSON = (
+    "{\n"
+    "  \"compilerOptions\": {\n"
+    "    \"target\": \"ES2020\",\n"
+    "    \"lib\": [\"ES2020\", \"DOM\", \"DOM.Iterable\"],\n"
+    "    \"jsx\": \"react-jsx\",\n"
+    "    \"module\": \"ESNext\",\n"
+    "    \"moduleResolution\": \"Bundler\",\n"
+    "    \"strict\": true,\n"
+    "    \"skipLibCheck\": true\n"
+    "  },\n"
+    "  \"include\": [\"src\", \"index.tsx\"]\n"
+    "}\n"
+)
+
+_TEST_FRONTEND_PY = (
+    "import json\nfrom pathlib import Path\n\n"
+    "def test_package_json_valid_and_has_scripts():\n"
+    "    p = Path('package.json')\n    s = p.read_text(encoding='utf-8')\n    pkg = json.loads(s)\n    assert 'scripts' in pkg and 'dev' in pkg['scripts'] and 'build' in pkg['scripts']\n    assert 'dependencies' in pkg and 'react' in pkg['dependencies']\n\n"
+    "def test_vite_and_tailwind_files_exist():\n"
+    "    for path in ['vite.config.js','tailwind.config.js','postcss.config.js','index.html']:\n        \n            assert Path(path).exists()\n"
+)
+
+_TEST_TS_ENTRY_PY = (
+    "from pathlib import Path\n\n"
+    "def test_ts_entry_if_present_is_nonempty():\n"
+    "    p = Path('index.tsx')\n    if p.exists():\n        s = p.read_text(encoding='utf-8').strip()\n        assert s.startswith('import')\n"
+)
+
+_PYPROJECT_TOML = (
+    "[build-system]\nrequires = ['setuptools', 'wheel']\n\n"
+    "[tool.pytest.ini_options]\npythonpath = ['.']\n"
+)
+
+
+# Shared template fragments (composed once at import)
+_REACT_IMPORT = "import React from 'react'\n"
+_APP_COMPONENT = (
+    "export default function App(){\n  return (\n    <main className=\"p-4 max-w-5xl mx-auto\">\n      <h1 className=\"text-2xl font-semibold mb-4\">Personal Project Manager</h1>\n      <KanbanBoard />\n    </main>\n  )\n}\n"
+)
+
+_INDEX_TSX = (
+    "// Root entry for Vite (TS)\n"
+    "import './src/main.tsx'\n"
+)
+
+_MAIN_TSX = (
+    _REACT_IMPORT
+    + "import { createRoot } from 'react-dom/client'\n"
+    "import App from './App'\n"
+    "import './index.css'\n\n"
+    "const el = document.getElementById('root') as HTMLElement\n"
+    "createRoot(el).render(<App />)\n"
+)
+
+_APP_TSX = (
+    _REACT_IMPORT
+    + "import KanbanBoard from '../components/KanbanBoard'\n"
+    + _APP_COMPONENT
+)
+
+_MAIN_JSX = (
+    _REACT_IMPORT
+    + "import { createRoot } from 'react-dom/client'\n"
+    "import App from './App.jsx'\n"
+    "import './index.css'\n\n"
+    "createRoot(document.getElementById('root')).render(<App />)\n"
+)
+
+_APP_JSX = (
+    _REACT_IMPORT
+    + "import KanbanBoard from '../components/KanbanBoard.js'\n"
+    + _APP_COMPONENT
+)
+
+_KANBAN_JS = (
+    _REACT_IMPORT
+    + "import { DndContext } from '@dnd-kit/core'\n"
+    "import Task from './Task.js'\n"
+    "export default function KanbanBoard(){\n  const columns = ['Backlog','In Progress','Done']\n  const tasks = [{ id: 't1', title: 'Sample task' }]\n  return (\n    <DndContext>\n      <div className=\"grid sm:grid-cols-3 gap-4\">\n        {columns.map((c) => (\n          <section key={c} className=\"bg-white rounded shadow p-3\">\n            <h2 className=\"font-medium mb-2\">{c}</h2>\n            <div className=\"space-y-2\">\n              {tasks.map(t => <Task key={t.id} task={t} />)}\n            </div>\n          </section>\n        ))}\n      </div>\n    </DndContext>\n  )\n}\n"
+)
+
+_TASK_JS = (
+    _REACT_IMPORT
+    + "export default function Task({ task }){\n  return <div className=\"border rounded px-2 py-1 bg-slate-50\">{task.title}</div>\n}\n"
+)
+
+_PROJECT_LIST_JS = (
+    _REACT_IMPORT
+    + "export default function ProjectList({ projects = [] }){\n  return (\n    <ul className=\"list-disc pl-6\">\n      {projects.map(p => <li key={p.id}>{p.name}</li>)}\n    </ul>\n  )\n}\n"
+)
+
+_DEXIE_DB_JS = (
+    "import Dexie from 'dexie'\n\n"
+    "export const db = new Dexie('ppm')\n"
+    "db.version(1).stores({\n  projects: '++id,name',\n  tasks: '++id,projectId,title,status'\n})\n"
+)
+
+_UTILS_PY = (
+    "def json_is_valid(text: str) -> bool:\n"
+    "    import json\n    try:\n        json.loads(text)\n        return True\n    except Exception:\n        return False\n"
+)
+
+_README_MD = (
+    "# Personal Project Manager (SPA)\n\n"
+    "Generated from requirements.json by the Kimi Coding Agent.\n\n"
+    "## Dev\n\n```bash\n"
+    "npm install\n"
+    "npm run dev\n```\n\n"
+    "## Build\n\n```bash\n"
+    "npm run build\n```\n\n"
+    "## Tests\n\nPython tests verify scaffold shape (no Node required):\n\n```bash\n"
+    "python -m pytest -q\n```\n"
+)
+
+_GITIGNORE = "node_modules/\n.dist/\n.DS_Store\n.env\n"
+
+# Shared scaffold, in write order. "package.json"/"index.html" are placeholders
+# filled per plan so the final key order is stable.
+_BASE_FILES_COMMON: Dict[str, str] = {
+    "package.json": "",
+    "vite.config.js": _VITE_CONFIG_JS,
+    "index.html": "",
+    "postcss.config.js": _POSTCSS_CONFIG,
+    "tailwind.config.js": _TAILWIND_CONFIG,
+    "src/index.css": _INDEX_CSS,
+}
+_BASE_FILES_TAIL: Dict[str, str] = {
+    # Components (JS keeps widest compat)
+    "components/KanbanBoard.js": _KANBAN_JS,
+    "components/Task.js": _TASK_JS,
+    "components/ProjectList.js": _PROJECT_LIST_JS,
+    "src/db/dexie.js": _DEXIE_DB_JS,
+    # Python side for validation
+    "tests/test_frontend_scaffold.py": _TEST_FRONTEND_PY,
+    "tests/test_ts_entry.py": _TEST_TS_ENTRY_PY,
+    "pyproject.toml": _PYPROJECT_TOML,
+    "utils.py": _UTILS_PY,
+    "README.md": _README_MD,
+    ".gitignore": _GITIGNORE,
+}
+_BASE_FILES_TS: Dict[str, str] = {
+    **_BASE_FILES_COMMON,
+    "index.tsx": _INDEX_TSX,
+    "src/main.tsx": _MAIN_TSX,
+    "src/App.tsx": _APP_TSX,
+    **_BASE_FILES_TAIL,
+    "tsconfig.json": _TSCONFIG_JSON,
+}
+_BASE_FILES_JS: Dict[str, str] = {
+    **_BASE_FILES_COMMON,
+    "src/main.jsx": _MAIN_JSX,
+    "src/App.jsx": _APP_JSX,
+    **_BASE_FILES_TAIL,
+}
+# UTF-8 bytes of every static template, keyed by the template text itself
+_TEMPLATE_BYTES: Dict[str, bytes] = {
+    text: text.encode("utf-8") for text in (*_BASE_FILES_TS.values(), *_BASE_FILES_JS.values()) if text
+}
+
+
 # ----------------------------------------------------------------------------
 # SPA plan (TS/JS aware) — returns path->content
 # ----------------------------------------------------------------------------
 
-def plan_spa_files(req: Dict[str, Any]) -> Dict[str, str]:
-    deps = infer_pkg_versions(req)
-    pkg_name = (_get(req, "project", "name", default="app") or "app").strip()
-    description = (_get(req, "project", "description", default="") or "").strip()
+def _dump_package_json(package_json: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(package_json, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE).decode("utf-8")
+    return json.dumps(package_json, indent=2) + "\n"
 
-    use_ts = wants_typescript(req) or True  # default to TS to avoid external tool errors
 
-    # package.json
+@functools.lru_cache(maxsize=32, typed=True)  # typed: version 1 vs 1.0 render differently
+def _package_json_text(name: str, version: Any, description: str, use_ts: bool) -> str:
+    """Rendered package.json; depends only on these fields (versions are the static defaults)."""
+    deps = _DEFAULT_PKG_VERSIONS
     dev_deps = {
         "vite": deps["vite"],
         "@vitejs/plugin-react": deps["@vitejs/plugin-react"],
@@ -363,8 +965,8 @@ def plan_spa_files(req: Dict[str, Any]) -> Dict[str, str]:
         })
 
     package_json = {
-        "name": pkg_name,
-        "version": _get(req, "project", "version", default="0.1.0") or "0.1.0",
+        "name": name,
+        "version": version,
         "private": True,
         "type": "module",
         "description": description,
@@ -382,192 +984,55 @@ def plan_spa_files(req: Dict[str, Any]) -> Dict[str, str]:
         },
         "devDependencies": dev_deps,
     }
+    return _dump_package_json(package_json)
 
-    # vite config (JS to keep it simple)
-    vite_config = (
-        "import { defineConfig } from 'vite'\n"
-        "import react from '@vitejs/plugin-react'\n\n"
-        "// https://vite.dev/config/\n"
-        "export default defineConfig({ plugins: [react()], server: { port: 5173 } })\n"
-    )
-
-    # index.html — pick correct entry
-    script_src = "/index.tsx" if use_ts else "/src/main.jsx"
-    index_html = (
-        "<!doctype html>\n<html lang=\"en\">\n  <head>\n    <meta charset=\"UTF-8\" />\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\" />\n    <title>"
-        + pkg_name
-        + "</title>\n  </head>\n  <body class=\"bg-gray-50 text-slate-900\">\n    <div id=\"root\"></div>\n    <script type=\"module\" src=\""
-        + script_src
-        + "\"></script>\n  </body>\n</html>\n"
-    )
-
-    postcss_config = (
-        "export default {\n  plugins: {\n    tailwindcss: {},\n    autoprefixer: {},\n  },\n}\n"
-    )
-
-    tailwind_config = (
-        "/** @type {import('tailwindcss').Config} */\nexport default {\n  content: [\n    './index.html',\n    './src/**/*.{js,jsx,ts,tsx}',\n  ],\n  theme: { extend: {} },\n  plugins: [],\n}\n"
-    )
-
-    index_css = (
-        "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n\n"
-        "/* App-level tweaks */\n#root { min-height: 100vh; }\n"
-    )
 
-    # React entries (TS or JS)
-    if use_ts:
-        index_tsx = (
-            "// Root entry for Vite (TS)\n"
-            "import './src/main.tsx'\n"
-        )
-        main_tsx = (
-            "import React from 'react'\n"
-            "import { createRoot } from 'react-dom/client'\n"
-            "import App from './App'\n"
-            "import './index.css'\n\n"
-            "const el = document.getElementById('root') as HTMLElement\n"
-            "createRoot(el).render(<App />)\n"
-        )
-        app_tsx = (
-            "import React from 'react'\n"
-            "import KanbanBoard from '../components/KanbanBoard'\n"
-            "export default function App(){\n  return (\n    <main className=\"p-4 max-w-5xl mx-auto\">\n      <h1 className=\"text-2xl font-semibold mb-4\">Personal Project Manager</h1>\n      <KanbanBoard />\n    </main>\n  )\n}\n"
-        )
-    else:
-        index_tsx = ""
-        main_tsx = ""
-        app_tsx = ""
-
-    # JS fallback files
-    main_jsx = (
-        "import React from 'react'\n"
-        "import { createRoot } from 'react-dom/client'\n"
-        "import App from './App.jsx'\n"
-        "import './index.css'\n\n"
-        "createRoot(document.getElementById('root')).render(<App />)\n"
-    )
+def _dir_prefixes(rel: str) -> Iterator[str]:
+    """Yield "a/", "a/b/", ... for rel = "a/b/file"."""
+    i = rel.find("/")
+    while i != -1:
+        yield rel[: i + 1]
+        i = rel.find("/", i + 1)
 
-    app_jsx = (
-        "import React from 'react'\n"
-        "import KanbanBoard from '../components/KanbanBoard.js'\n"
-        "export default function App(){\n  return (\n    <main className=\"p-4 max-w-5xl mx-auto\">\n      <h1 className=\"text-2xl font-semibold mb-4\">Personal Project Manager</h1>\n      <KanbanBoard />\n    </main>\n  )\n}\n"
-    )
 
-    kanban_js = (
-        "import React from 'react'\n"
-        "import { DndContext } from '@dnd-kit/core'\n"
-        "import Task from './Task.js'\n"
-        "export default function KanbanBoard(){\n  const columns = ['Backlog','In Progress','Done']\n  const tasks = [{ id: 't1', title: 'Sample task' }]\n  return (\n    <DndContext>\n      <div className=\"grid sm:grid-cols-3 gap-4\">\n        {columns.map((c) => (\n          <section key={c} className=\"bg-white rounded shadow p-3\">\n            <h2 className=\"font-medium mb-2\">{c}</h2>\n            <div className=\"space-y-2\">\n              {tasks.map(t => <Task key={t.id} task={t} />)}\n            </div>\n          </section>\n        ))}\n      </div>\n    </DndContext>\n  )\n}\n"
-    )
-
-    task_js = (
-        "import React from 'react'\n"
-        "export default function Task({ task }){\n  return <div className=\"border rounded px-2 py-1 bg-slate-50\">{task.title}</div>\n}\n"
-    )
-
-    project_list_js = (
-        "import React from 'react'\n"
-        "export default function ProjectList({ projects = [] }){\n  return (\n    <ul className=\"list-disc pl-6\">\n      {projects.map(p => <li key={p.id}>{p.name}</li>)}\n    </ul>\n  )\n}\n"
-    )
-
-    dexie_db_js = (
-        "import Dexie from 'dexie'\n\n"
-        "export const db = new Dexie('ppm')\n"
-        "db.version(1).stores({\n  projects: '++id,name',\n  tasks: '++id,projectId,title,status'\n})\n"
-    )
-
-    util_py = (
-        "def json_is_valid(text: str) -> bool:\n"
-        "    import json\n    try:\n        json.loads(text)\n        return True\n    except Exception:\n        return False\n"
-    )
-
-    test_frontend_py = (
-        "import json\nfrom pathlib import Path\n\n"
-        "def test_package_json_valid_and_has_scripts():\n"
-        "    p = Path('package.json')\n    s = p.read_text(encoding='utf-8')\n    pkg = json.loads(s)\n    assert 'scripts' in pkg and 'dev' in pkg['scripts'] and 'build' in pkg['scripts']\n    assert 'dependencies' in pkg and 'react' in pkg['dependencies']\n\n"
-        "def test_vite_and_tailwind_files_exist():\n"
-        "    for path in ['vite.config.js','tailwind.config.js','postcss.config.js','index.html']:\n        \n            assert Path(path).exists()\n"
-    )
-
-    test_ts_entry_py = (
-        "from pathlib import Path\n\n"
-        "def test_ts_entry_if_present_is_nonempty():\n"
-        "    p = Path('index.tsx')\n    if p.exists():\n        s = p.read_text(encoding='utf-8').strip()\n        assert s.startswith('import')\n"
-    )
-
-    pyproject = (
-        "[build-system]\nrequires = ['setuptools', 'wheel']\n\n"
-        "[tool.pytest.ini_options]\npythonpath = ['.']\n"
-    )
-
-    readme = (
-        "# Personal Project Manager (SPA)\n\n"
-        "Generated from requirements.json by the Kimi Coding Agent.\n\n"
-        "## Dev\n\n```bash\n"
-        "npm install\n"
-        "npm run dev\n```\n\n"
-        "## Build\n\n```bash\n"
-        "npm run build\n```\n\n"
-        "## Tests\n\nPython tests verify scaffold shape (no Node required):\n\n```bash\n"
-        "python -m pytest -q\n```\n"
-    )
-
-    files: Dict[str, str] = {
-        "package.json": json.dumps(package_json, indent=2) + "\n",
-        "vite.config.js": vite_config,
-        "index.html": index_html,
-        "postcss.config.js": postcss_config,
-        "tailwind.config.js": tailwind_config,
-        "src/index.css": index_css,
-        # TS or JS entries
-        "index.tsx": index_tsx if use_ts else "",
-        "src/main.tsx": main_tsx if use_ts else "",
-        "src/App.tsx": app_tsx if use_ts else "",
-        "src/main.jsx": "" if use_ts else main_jsx,
-        "src/App.jsx": "" if use_ts else app_jsx,
-        # Components (JS keeps widest compat)
-        "components/KanbanBoard.js": kanban_js,
-        "components/Task.js": task_js,
-        "components/ProjectList.js": project_list_js,
-        "src/db/dexie.js": dexie_db_js,
-        # Python side for validation
-        "tests/test_frontend_scaffold.py": test_frontend_py,
-        "tests/test_ts_entry.py": test_ts_entry_py,
-        "pyproject.toml": pyproject,
-        "utils.py": util_py,
-        "README.md": readme,
-        ".gitignore": "node_modules/\n.dist/\n.DS_Store\n.env\n",
-    }
+def plan_spa_files(req: Dict[str, Any]) -> Dict[str, str]:
+    pkg_name = (_get(req, "project", "name", default="app") or "app").strip()
+    description = (_get(req, "project", "description", default="") or "").strip()
+    version = _get(req, "project", "version", default="0.1.0") or "0.1.0"
 
-    if use_ts:
-        tsconfig = (
-            "{\n"
-            "  \"compilerOptions\": {\n"
-            "    \"target\": \"ES2020\",\n"
-            "    \"lib\": [\"ES2020\", \"DOM\", \"DOM.Iterable\"],\n"
-            "    \"jsx\": \"react-jsx\",\n"
-            "    \"module\": \"ESNext\",\n"
-            "    \"moduleResolution\": \"Bundler\",\n"
-            "    \"strict\": true,\n"
-            "    \"skipLibCheck\": true\n"
-            "  },\n"
-            "  \"include\": [\"src\", \"index.tsx\"]\n"
-            "}\n"
-        )
-        files["tsconfig.json"] = tsconfig
+    use_ts = wants_typescript(req) or True  # default to TS to avoid external tool errors
 
-    # Ensure any user-declared directories/files are honored
-    for d in (_get(req, "file_structure", "directories", default=[]) or []):
-        if d.endswith("/"):
-            d = d[:-1]
-        files.setdefault(f"{d}/.keep", "")
-    for dir_prefix, names in ((_get(req, "file_structure", "files", default={}) or {}).items()):
-        for nm in names:
-            rel = f"{dir_prefix}{nm}"
-            files.setdefault(rel, files.get(rel, ""))
+    try:
+        package_json_text = _package_json_text(pkg_name, version, description, use_ts)
+    except TypeError:  # unhashable version value (e.g. a list) — render uncached
+        package_json_text = _package_json_text.__wrapped__(pkg_name, version, description, use_ts)
 
-    # Remove empty placeholders to avoid writing empty files when JS/TS toggles
-    files = {k: v for k, v in files.items() if v != ""}
+    # index.html — pick correct entry
+    script_src = "/index.tsx" if use_ts else "/src/main.jsx"
+    index_html = "".join((_INDEX_HTML_HEAD, pkg_name, _INDEX_HTML_MID, script_src, _INDEX_HTML_TAIL))
+
+    # Static templates are shared; only the dynamic entries are filled in here
+    files = (_BASE_FILES_TS if use_ts else _BASE_FILES_JS).copy()
+    files["package.json"] = package_json_text
+    files["index.html"] = index_html
+
+    # Honor user-declared directories in one pass: any that no generated file lands
+    # under gets a .keep so it still exists. Declared file names carry no content, so
+    # they are only written when the plan generates them.
+    declared = _get(req, "file_structure", "directories", default=[]) or []
+    if declared:
+        # Every "dir/" prefix that already holds a generated file, built once so
+        # each declared directory is a set lookup rather than a scan of files
+        occupied = {p for rel in files for p in _dir_prefixes(rel)}
+    for d in declared:
+        prefix = str(d).removesuffix("/") + "/"
+        keep = prefix + ".keep"
+        if not _is_safe_relpath(keep):
+            logging.warning(f"Ignoring unsafe directory in file_structure: {d!r}")
+            continue
+        if prefix not in occupied:
+            files[keep] = ""
+            occupied.update(_dir_prefixes(keep))
 
     return files
 
@@ -579,6 +1044,12 @@ DEFAULT_MODEL = os.getenv("KIMI_MODEL") or os.getenv("MOONSHOT_MODEL") or "kimi-
 
 
 def build_agent(verbose: bool) -> Agent[AgentContext]:
+    return _cached_agent(verbose, DEFAULT_MODEL)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_agent(verbose: bool, model: str) -> Agent[AgentContext]:
+    """Build the agent (instructions + tool schemas) once per (verbose, model)."""
     if verbose:
         enable_verbose_stdout_logging()
 
@@ -623,7 +1094,7 @@ def build_agent(verbose: bool) -> Agent[AgentContext]:
         name="Kimi Coding Agent v6.1",
         instructions=instructions,
         tools=tools,
-        model=DEFAULT_MODEL,
+        model=model,
         model_settings=ModelSettings(temperature=0.2),
     )
     return agent
@@ -633,13 +1104,42 @@ def build_agent(verbose: bool) -> Agent[AgentContext]:
 # Deterministic bootstrap for SPA (no LLM involvement) — smoke test
 # ----------------------------------------------------------------------------
 
+def _encode_template(content: str) -> bytes:
+    # Static templates were encoded at import; only dynamic files (package.json,
+    # index.html) are encoded here. Template strs keep their hash cached, so hits are O(1).
+    data = _TEMPLATE_BYTES.get(content)
+    return data if data is not None else content.encode("utf-8")
+
+
+def _write_scaffold_zip(zip_path: Path, files: Dict[str, str]) -> None:
+    # One file descriptor for the whole scaffold: no per-file open/mkdir metadata churn
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for rel, content in files.items():
+            zf.writestr(rel, content)
+
+
 def bootstrap_spa(base_dir: Path, req: Dict[str, Any]):
-    files = plan_spa_files(req)
+    if base_dir.suffix == ".zip":
+        files = plan_spa_files(req)
+        _validate_relpaths(files)
+        _write_scaffold_zip(base_dir, files)
+        return
     (base_dir).mkdir(parents=True, exist_ok=True)
-    for rel, content in files.items():
-        p = _resolve_safe(base_dir, rel)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(content, encoding="utf-8")
+    files = plan_spa_files(req)
+    # Validate once, then build targets with plain string joins (no per-file resolve())
+    _validate_relpaths(files)
+    base_str = str(base_dir)
+    targets = {rel: os.path.join(base_str, rel) for rel in files}
+    # One makedirs per unique parent instead of one mkdir(parents=True) per file
+    for d in sorted({os.path.dirname(t) for t in targets.values()}, key=len):
+        os.makedirs(d, exist_ok=True)
+    # Writes are I/O-bound and release the GIL; overlap them (errors still propagate)
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(files)))) as ex:
+        list(ex.map(
+            lambda kv: _fast_write_bytes(targets[kv[0]], _encode_template(kv[1])),
+            files.items(),
+        ))
 
 
 # ----------------------------------------------------------------------------
@@ -656,33 +1156,49 @@ def main():
     parser.add_argument("--prompt", type=str, default="Scaffold the project described in the requirements.json.")
     args = parser.parse_args()
 
-    base_dir = Path(args.base_dir).expanduser().resolve()
-    req_path = Path(args.requirements).expanduser().resolve()
+    # abspath is pure string work; resolve() would stat every component for no benefit here
+    base_dir = Path(os.path.abspath(os.path.expanduser(args.base_dir)))
+    req_path = Path(os.path.abspath(os.path.expanduser(args.requirements)))
 
     logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 
     # Read requirements first
     if not req_path.exists():
         raise SystemExit(f"Requirements file not found: {req_path}")
-    req = json.loads(req_path.read_text(encoding="utf-8"))
+    if orjson is not None:
+        req = orjson.loads(req_path.read_bytes())  # parses UTF-8 bytes directly, no decode step
+    else:
+        req = json.loads(req_path.read_text(encoding="utf-8"))
 
     if args.bootstrap or is_spa(req):
         # Deterministic SPA write path (no LLM needed)
         bootstrap_spa(base_dir, req)
-        # Also run validation locally so user gets immediate signal
-        compiled_ok = bool(compileall.compile_dir(str(base_dir), quiet=1, force=False, maxlevels=10))
-        # run pytest if present
-        code, out, err = _run_subprocess([sys.executable, "-m", "pytest", "-q"], cwd=base_dir, timeout=180)
+        if base_dir.suffix == ".zip":
+            # Nothing on disk to compile or test; the archive is the deliverable
+            print(f"\nWrote project archive to: {base_dir}")
+            return
+        # Also run validation locally so user gets immediate signal. Byte-compiling
+        # checks syntax without importing anything, so module-level side effects
+        # and missing third-party deps don't count as compile failures. It runs
+        # alongside the streamed pytest run (both write .pyc files atomically)
+        # and is joined before the result is recorded.
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            compile_future = ex.submit(py_compile_all_impl, base_dir)
+            code, out, err = _run_subprocess(
+                [sys.executable, "-m", "pytest", "-q"], cwd=base_dir, timeout=180, stream_output=True
+            )
+            compiled = compile_future.result()
+        compiled_ok = compiled["compiled"]
         validation = ValidationResult(
             compiled_ok=compiled_ok,
-            compile_errors=[],
+            compile_errors=compiled.get("errors", []),
             pytest_ok=(code == 0),
             pytest_returncode=code,
             pytest_stdout=out,
             pytest_stderr=err,
         )
-        (base_dir / "artifacts").mkdir(parents=True, exist_ok=True)
-        (base_dir / "artifacts" / "validation.json").write_text(validation.model_dump_json(indent=2), encoding="utf-8")
+        # Same writer as the record_validation tool (orjson when available)
+        record_validation_impl(base_dir, validation)
         print("\n==== SUMMARY ====\n")
         print(f"Wrote project to: {base_dir}")
         print(f"Compile: {'OK' if compiled_ok else 'FAIL'}")
@@ -694,13 +1210,21 @@ def main():
     _configure_kimi_client()
 
     agent = build_agent(verbose=args.verbose)
-    ctx = AgentContext(base_dir=base_dir, requirements_path=req_path, dry_run=args.dry_run)
+    ctx = AgentContext(
+        base_dir=base_dir,
+        requirements_path=req_path,
+        dry_run=args.dry_run,
+        requirements_cache=req,
+    )
 
-    result = Runner.run_sync(
-        agent,
-        input=args.prompt,
-        context=ctx,
-        max_turns=1000,
+    # Async runner: the (async) tools' I/O overlaps with pending model round trips
+    result = asyncio.run(
+        Runner.run(
+            agent,
+            input=args.prompt,
+            context=ctx,
+            max_turns=1000,
+        )
     )
 
     print("\n==== FINAL OUTPUT ====\n")
@@ -1,6 +1,7 @@
 import re
+from functools import lru_cache
 from importlib import import_module
-from typing import Dict
+from typing import Any, Dict, Iterator, List, Pattern, Tuple
 
 KEYWORDS: Dict[str, str] = {
     r"spa|react|vue|svelte|front.end|vite": "spa_react",
@@ -13,12 +14,45 @@ KEYWORDS: Dict[str, str] = {
     r"terraform|pulumi|infra|iac": "iac_terraform",
 }
 
+# Compiled once at import; classify() no longer goes through the re cache
+_COMPILED: List[Tuple[Pattern[str], str]] = [(re.compile(rx), name) for rx, name in KEYWORDS.items()]
+
+def _iter_strings(obj: Any) -> Iterator[str]:
+    """Yield the scalar leaves (and dict keys) of a requirements doc as strings."""
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            for k, v in cur.items():
+                yield str(k)
+                stack.append(v)
+        elif isinstance(cur, (list, tuple, set)):
+            stack.extend(cur)
+        elif cur is not None:
+            yield str(cur)
+
 def classify(requirements: dict) -> str:
-    flat = str(requirements).lower()
-    for regex, pack in KEYWORDS.items():
-        if re.search(regex, flat):
+    # Join the leaves once (no quoting/escaping from a dict repr) and lower once;
+    # "\n" separators keep patterns from matching across two values
+    flat = "\n".join(_iter_strings(requirements)).lower()
+    for rx, pack in _COMPILED:
+        if rx.search(flat):
             return pack
     return "unknown"
 
+# Lazy + memoized: several KEYWORDS packs have no module yet, so no eager import
+@lru_cache(maxsize=None)
 def get_pack(name: str):
-    return import_module(f"packs.{name}")
\ No newline at end of file
+    return import_module(f"packs.{name}")
+
+def dry_run_result():
+    """Passing ValidationResult for ctx.dry_run: no mypy/ruff/pytest/npm/docker is launched."""
+    from kimi_coding_agent_v_6_1 import ValidationResult
+    return ValidationResult(
+        compiled_ok=True,
+        compile_errors=[],
+        pytest_ok=True,
+        pytest_returncode=0,
+        pytest_stdout="",
+        pytest_stderr="",
+    )
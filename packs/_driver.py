@@ -0,0 +1,115 @@
+"""
+Validation driver – run several Python checks in ONE interpreter.
+
+Each `python -m mypy` / `python -m pytest` launch pays interpreter start-up plus
+the tool's import time. Packs shell out to this file once instead; mypy and
+pytest run in-process, ruff runs as its native binary (no Python cold start)
+alongside them.
+
+Usage: python _driver.py <base_dir> <step> [<step> ...]   (steps: mypy ruff pytest)
+The last stdout line is a JSON object {step: [returncode, stdout, stderr]}.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+DRIVER_PATH = str(Path(__file__).resolve())
+_PY = sys.executable
+STEPS = ("mypy", "ruff", "pytest")
+
+StepResult = Tuple[int, str, str]
+
+
+def command(*steps: str) -> List[str]:
+    """argv for running *steps* through the driver (cwd must be the project dir)."""
+    return [_PY, DRIVER_PATH, ".", *steps]
+
+
+def parse(code: int, out: str, err: str, steps: Sequence[str]) -> Dict[str, StepResult]:
+    """Decode the driver's result line; if it died, blame every step with its output."""
+    lines = out.rstrip().splitlines()
+    if lines:
+        try:
+            data = json.loads(lines[-1])
+            return {s: tuple(data[s]) for s in steps}  # type: ignore[misc]
+        except (ValueError, KeyError, TypeError):
+            pass
+    return {s: (code or 1, out, err) for s in steps}
+
+
+def _capture(fn) -> StepResult:
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            code = int(fn() or 0)
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except Exception as exc:  # tool crashed – report, don't take the driver down
+            print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+            code = 1
+    return code, out.getvalue(), err.getvalue()
+
+
+def _run_mypy() -> StepResult:
+    try:
+        from mypy import api
+    except ImportError:
+        proc = subprocess.run([_PY, "-m", "mypy", "src"], capture_output=True, text=True)
+        return proc.returncode, proc.stdout, proc.stderr
+    out, err, code = api.run(["src"])
+    return code, out, err
+
+
+def _run_pytest() -> StepResult:
+    try:
+        import pytest
+    except ImportError:
+        proc = subprocess.run([_PY, "-m", "pytest", "-q"], capture_output=True, text=True)
+        return proc.returncode, proc.stdout, proc.stderr
+    return _capture(lambda: pytest.main(["-q"]))
+
+
+def _start_ruff() -> subprocess.Popen:
+    exe = shutil.which("ruff")
+    cmd = [exe, "check", "."] if exe else [_PY, "-m", "ruff", "check", "."]
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def _use_project_path(base_dir: str) -> None:
+    """Resolve imports like `python -m`: project dir first, packs/ (the script dir) gone."""
+    here = os.path.dirname(DRIVER_PATH)
+    sys.path[:] = [p for p in sys.path if os.path.realpath(p or os.curdir) != here]
+    sys.path.insert(0, base_dir)
+
+
+def run_all(base_dir: str, steps: Sequence[str] = STEPS) -> Dict[str, StepResult]:
+    base_dir = os.path.abspath(base_dir)
+    os.chdir(base_dir)
+    _use_project_path(base_dir)  # in-process mypy/pytest would otherwise import packs/*.py
+    results: Dict[str, StepResult] = {}
+    ruff = _start_ruff() if "ruff" in steps else None  # runs while mypy/pytest work in-process
+    if "mypy" in steps:
+        results["mypy"] = _run_mypy()
+    if "pytest" in steps:  # last: test imports can leave sys.modules dirty
+        results["pytest"] = _run_pytest()
+    if ruff is not None:
+        out, err = ruff.communicate()
+        results["ruff"] = (ruff.returncode, out, err)
+    return results
+
+
+if __name__ == "__main__":
+    base, *wanted = sys.argv[1:] or ["."]
+    unknown = [s for s in wanted if s not in STEPS]
+    if unknown:
+        sys.exit(f"unknown step(s): {', '.join(unknown)}")
+    res = run_all(base, wanted or STEPS)
+    sys.stdout.write("\n" + json.dumps(res) + "\n")
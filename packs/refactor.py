@@ -1,65 +1,85 @@
 """
 Refactor pack – black, ruff, mypy, pytest, CI, pre-commit.
 """
+import sys
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+from packs import _driver, dry_run_result
 from kimi_coding_agent_v_6_1 import ValidationResult, AgentContext, _run_subprocess
 
-def plan_files(_req: dict) -> dict[str, str]:
-    return {
-        "pyproject.toml": textwrap.dedent("""\
-            [tool.ruff]
-            line-length = 88
-            select = ["E", "F", "I", "N", "UP", "ANN", "S", "B", "C4", "DTZ", "TCH"]
-            ignore = ["ANN101"]
+# Static plan: built (and dedented) once, shared read-only
+_PLAN: Mapping[str, str] = MappingProxyType({
+    "pyproject.toml": textwrap.dedent("""\
+        [tool.ruff]
+        line-length = 88
+        select = ["E", "F", "I", "N", "UP", "ANN", "S", "B", "C4", "DTZ", "TCH"]
+        ignore = ["ANN101"]
 
-            [tool.black]
-            line-length = 88
+        [tool.black]
+        line-length = 88
 
-            [tool.mypy]
-            strict = true
-        """),
-        ".github/workflows/ci.yml": textwrap.dedent("""\
-            name: CI
-            on: [push, pull_request]
-            jobs:
-              lint:
-                runs-on: ubuntu-latest
-                steps:
-                  - uses: actions/checkout@v4
-                  - uses: actions/setup-python@v4
-                    with: { python-version: "3.11" }
-                  - run: pip install ruff black mypy pytest
-                  - run: ruff check .
-                  - run: black --check .
-                  - run: mypy src
-                  - run: pytest
-        """),
-        ".pre-commit-config.yaml": textwrap.dedent("""\
-            repos:
-              - repo: https://github.com/astral-sh/ruff-pre-commit
-                rev: v0.1.0
-                hooks: [id: ruff]
-              - repo: https://github.com/psf/black
-                rev: 23.9.1
-                hooks: [id: black]
-        """),
-        "README_refactor.md": "# Refactored with kimī agent\n\nBlack + Ruff + MyPy + pre-commit enabled.",
-    }
+        [tool.mypy]
+        strict = true
+    """),
+    ".github/workflows/ci.yml": textwrap.dedent("""\
+        name: CI
+        on: [push, pull_request]
+        jobs:
+          lint:
+            runs-on: ubuntu-latest
+            steps:
+              - uses: actions/checkout@v4
+              - uses: actions/setup-python@v4
+                with: { python-version: "3.11" }
+              - run: pip install ruff black mypy pytest
+              - run: ruff check .
+              - run: black --check .
+              - run: mypy src
+              - run: pytest
+    """),
+    ".pre-commit-config.yaml": textwrap.dedent("""\
+        repos:
+          - repo: https://github.com/astral-sh/ruff-pre-commit
+            rev: v0.1.0
+            hooks: [id: ruff]
+          - repo: https://github.com/psf/black
+            rev: 23.9.1
+            hooks: [id: black]
+    """),
+    "README_refactor.md": "# Refactored with kimī agent\n\nBlack + Ruff + MyPy + pre-commit enabled.",
+})
+
+_PY = sys.executable
+_BLACK_CMD = [_PY, "-m", "black", "--check", "."]
+_CHECK_STEPS = ("ruff", "mypy", "pytest")
+_CHECKS_CMD = _driver.command(*_CHECK_STEPS)
+
+def plan_files(_req: dict) -> Mapping[str, str]:
+    return _PLAN
 
 def validate(ctx: AgentContext) -> ValidationResult:
-    dry = ctx.dry_run
-    def run(cmd):
-        return _run_subprocess(cmd, cwd=ctx.base_dir, timeout=60)
+    if ctx.dry_run:
+        return dry_run_result()
+    return _validate_real(ctx)
+
+def _validate_real(ctx: AgentContext) -> ValidationResult:
+    def run(cmd, timeout=60):
+        return _run_subprocess(cmd, cwd=ctx.base_dir, timeout=timeout)
+
+    # ruff/mypy/pytest share one interpreter (see packs/_driver.py); black runs beside it
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        checks_f = pool.submit(run, _CHECKS_CMD, 60 * len(_CHECK_STEPS))
+        black_f = pool.submit(run, _BLACK_CMD)
+    checks = _driver.parse(*checks_f.result(), _CHECK_STEPS)
 
-    code, _, _ = run([sys.executable, "-m", "ruff", "check", "."])
-    ruff_ok = dry or code == 0
-    code, _, _ = run([sys.executable, "-m", "black", "--check", "."])
-    black_ok = dry or code == 0
-    code, _, _ = run([sys.executable, "-m", "mypy", "src"])
-    mypy_ok = dry or code == 0
-    code, out, err = run([sys.executable, "-m", "pytest", "-q"])
-    pytest_ok = dry or code == 0
+    ruff_ok = checks["ruff"][0] == 0
+    black_ok = black_f.result()[0] == 0
+    mypy_ok = checks["mypy"][0] == 0
+    code, out, err = checks["pytest"]
+    pytest_ok = code == 0
 
     return ValidationResult(
         compiled_ok=ruff_ok and black_ok and mypy_ok,
@@ -0,0 +1,30 @@
+import pytest
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Shared, read-once inputs for test_app.py / test_validation.py.
+# Session scope also means one copy per worker under `pytest -n auto`.
+
+
+@pytest.fixture(scope="session")
+def scrape_response():
+    # Imported here so test_validation.py still runs without fastapi installed
+    from fastapi.testclient import TestClient
+    from server.main import app
+
+    return TestClient(app).get("/api/scrape-fantasy-data")
+
+
+@pytest.fixture(scope="session")
+def fantasy_response(scrape_response):
+    # Body of the same single request whose status/headers scrape_response exposes
+    return json_loads(scrape_response.content)
+
+
+@pytest.fixture(scope="session")
+def server_source():
+    with open('server/main.py', 'r') as f:
+        return f.read()
@@ -1,8 +1,27 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-import asyncio
+from fastapi.responses import ORJSONResponse
+import aiohttp
+import orjson
+import os
 
-app = FastAPI()
+def _new_session() -> aiohttp.ClientSession:
+    # One pooled keep-alive session for all outbound calls
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=30),
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Created inside the serving loop, so the session is bound to the loop that uses it
+    async with _new_session() as session:
+        app.state.http = session
+        yield
+    app.state.http = None
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,30 +31,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Static mock data: serialized once, served as-is (no per-request dict/validation/encode)
+_PLAYERS = {
+    "players": [
+        {
+            "id": 1,
+            "player_name": "Christian McCaffrey",
+            "team": "SF",
+            "position": "RB",
+            "power_score": 94.2,
+            "sleeper_rating": 3.2,
+            "matchup_difficulty": "Favorable",
+            "risk_level": "Low"
+        },
+        {
+            "id": 2,
+            "player_name": "Jaylen Warren",
+            "team": "PIT",
+            "position": "RB",
+            "power_score": 78.5,
+            "sleeper_rating": 8.9,
+            "matchup_difficulty": "Neutral",
+            "risk_level": "Medium"
+        }
+    ]
+}
+_PAYLOAD = orjson.dumps(_PLAYERS)
+
+# Real data source; when unset the endpoint serves the mock payload above
+UPSTREAM_URL = os.environ.get("FANTASY_UPSTREAM_URL", "")
+
+async def _fetch_upstream(session: aiohttp.ClientSession) -> bytes:
+    async with session.get(UPSTREAM_URL) as r:
+        r.raise_for_status()
+        # Upstream already speaks JSON: pass the bytes through untouched
+        return await r.read()
+
 @app.get("/api/scrape-fantasy-data")
 async def scrape_fantasy_data():
-    await asyncio.sleep(1)
-    return {
-        "players": [
-            {
-                "id": 1,
-                "player_name": "Christian McCaffrey",
-                "team": "SF",
-                "position": "RB",
-                "power_score": 94.2,
-                "sleeper_rating": 3.2,
-                "matchup_difficulty": "Favorable",
-                "risk_level": "Low"
-            },
-            {
-                "id": 2,
-                "player_name": "Jaylen Warren",
-                "team": "PIT",
-                "position": "RB",
-                "power_score": 78.5,
-                "sleeper_rating": 8.9,
-                "matchup_difficulty": "Neutral",
-                "risk_level": "Medium"
-            }
-        ]
-    }
\ No newline at end of file
+    if not UPSTREAM_URL:
+        return Response(content=_PAYLOAD, media_type="application/json")
+    session = getattr(app.state, "http", None)
+    if session is None:
+        # No lifespan (e.g. a bare TestClient(app)): use a session scoped to this
+        # request rather than one bound to whichever loop served the first call
+        async with _new_session() as session:
+            body = await _fetch_upstream(session)
+    else:
+        body = await _fetch_upstream(session)
+    return Response(content=body, media_type="application/json")
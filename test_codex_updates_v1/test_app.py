@@ -1,14 +1,11 @@
 import pytest
-import json
-from server.main import app
-from fastapi.testclient import TestClient
 
-client = TestClient(app)
+_POS = frozenset({"QB", "RB", "WR", "TE"})
+_NUM = (int, float)
 
-def test_scrape_fantasy_data_endpoint():
-    response = client.get("/api/scrape-fantasy-data")
-    assert response.status_code == 200
-    data = response.json()
+def test_scrape_fantasy_data_endpoint(scrape_response, fantasy_response):
+    assert scrape_response.status_code == 200
+    data = fantasy_response
     assert "players" in data
     assert len(data["players"]) > 0
     
@@ -20,27 +17,24 @@ def test_scrape_fantasy_data_endpoint():
     assert "power_score" in player
     assert "sleeper_rating" in player
 
-def test_cors_headers():
-    response = client.get("/api/scrape-fantasy-data")
-    assert response.status_code == 200
-    assert "access-control-allow-origin" in response.headers
+def test_cors_headers(scrape_response):
+    assert scrape_response.status_code == 200
+    assert "access-control-allow-origin" in scrape_response.headers
 
-def test_player_data_structure():
-    response = client.get("/api/scrape-fantasy-data")
-    data = response.json()
+def test_player_data_structure(fantasy_response):
+    data = fantasy_response
     
     for player in data["players"]:
         assert isinstance(player["id"], int)
         assert isinstance(player["player_name"], str)
         assert isinstance(player["team"], str)
         assert isinstance(player["position"], str)
-        assert isinstance(player["power_score"], (int, float))
-        assert isinstance(player["sleeper_rating"], (int, float))
-        assert player["position"] in ["QB", "RB", "WR", "TE"]
+        assert type(player["power_score"]) in _NUM
+        assert type(player["sleeper_rating"]) in _NUM
+        assert player["position"] in _POS
 
-def test_sleeper_player_identification():
-    response = client.get("/api/scrape-fantasy-data")
-    data = response.json()
+def test_sleeper_player_identification(fantasy_response):
+    data = fantasy_response
     
     sleeper_players = [p for p in data["players"] if p["sleeper_rating"] > 7.5]
     assert len(sleeper_players) >= 1
@@ -1,5 +1,24 @@
 import os
-import json
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional for the structure checks
+    from json import loads as json_loads
+
+@lru_cache(maxsize=None)
+def _dir_entries(directory):
+    # one scandir per directory instead of a stat per checked path
+    try:
+        with os.scandir(directory or '.') as it:
+            return frozenset(e.name for e in it)
+    except FileNotFoundError:
+        return frozenset()
+
+def _exists(file_path):
+    directory, name = os.path.split(file_path)
+    return name in _dir_entries(directory)
 
 def test_file_structure():
     required_files = [
@@ -14,12 +33,11 @@ def test_file_structure():
     ]
     
     for file_path in required_files:
-        assert os.path.exists(file_path), f"Required file missing: {file_path}"
+        assert _exists(file_path), f"Required file missing: {file_path}"
         print(f"✓ Found: {file_path}")
 
 def test_package_json():
-    with open('package.json', 'r') as f:
-        package_data = json.load(f)
+    package_data = json_loads(Path('package.json').read_bytes())
     
     required_deps = ['react', 'react-dom', 'vite', 'tailwindcss', 'dexie', '@dnd-kit/core']
     for dep in required_deps:
@@ -34,26 +52,24 @@ def test_react_components():
     ]
     
     for component_file in component_files:
-        assert os.path.exists(component_file), f"Component missing: {component_file}"
-        with open(component_file, 'r') as f:
-            content = f.read()
-            assert 'export default' in content, f"Component not properly exported: {component_file}"
+        assert _exists(component_file), f"Component missing: {component_file}"
+        # bytes search: no need to decode the whole file
+        content = Path(component_file).read_bytes()
+        assert b'export default' in content, f"Component not properly exported: {component_file}"
         print(f"✓ Component validated: {component_file}")
 
-def test_python_backend():
+def test_python_backend(server_source):
     assert os.path.exists('server/main.py'), "Python backend missing"
     
-    with open('server/main.py', 'r') as f:
-        content = f.read()
-        assert 'FastAPI' in content, "FastAPI not imported"
-        assert '@app.get("/api/scrape-fantasy-data")' in content, "API endpoint not found"
-        assert 'scrape-fantasy-data' in content, "Scraping functionality missing"
+    content = server_source
+    assert 'FastAPI' in content, "FastAPI not imported"
+    assert '@app.get("/api/scrape-fantasy-data")' in content, "API endpoint not found"
+    assert 'scrape-fantasy-data' in content, "Scraping functionality missing"
     
     print("✓ Python backend validated")
 
-def test_data_structure():
-    with open('server/main.py', 'r') as f:
-        content = f.read()
+def test_data_structure(server_source):
+    content = server_source
     
     required_fields = ['player_name', 'team', 'position', 'power_score', 'sleeper_rating']
     for field in required_fields:
@@ -62,9 +78,11 @@ def test_data_structure():
 
 if __name__ == "__main__":
     print("Running validation tests...")
+    with open('server/main.py', 'r') as f:
+        source = f.read()
     test_file_structure()
     test_package_json()
     test_react_components()
-    test_python_backend()
-    test_data_structure()
+    test_python_backend(source)
+    test_data_structure(source)
     print("\n✅ All validation tests passed!")
\ No newline at end of file
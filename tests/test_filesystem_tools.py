@@ -0,0 +1,106 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from kimi_coding_agent_v5 import FileItem, FileMap, write_many_impl, write_text_file_impl
+
+
+def test_write_text_file_impl_supports_nested_directories(tmp_path):
+    result = write_text_file_impl(tmp_path, "src/nested/module.py", "print('hi')\n")
+
+    assert result["ok"] is True
+    assert (tmp_path / "src" / "nested" / "module.py").read_text(encoding="utf-8") == "print('hi')\n"
+
+
+def test_write_text_file_impl_truncates_existing_content(tmp_path):
+    target = tmp_path / "notes.txt"
+    target.write_text("a much longer original body", encoding="utf-8")
+
+    write_text_file_impl(tmp_path, "notes.txt", "short")
+
+    assert target.read_text(encoding="utf-8") == "short"
+
+
+def test_write_many_impl_writes_shared_parents_and_reports_unsafe_paths(tmp_path):
+    files = FileMap(
+        files=[
+            FileItem(path="src/a.py", content="a = 1\n"),
+            FileItem(path="src/b.py", content="b = 'é'\n"),
+            FileItem(path="../escape.txt", content="nope"),
+        ]
+    )
+
+    result = write_many_impl(tmp_path, files)
+
+    assert result["results"]["src/a.py"]["ok"] is True
+    assert (tmp_path / "src" / "b.py").read_text(encoding="utf-8") == "b = 'é'\n"
+    assert result["results"]["../escape.txt"]["ok"] is False
+    assert not (tmp_path.parent / "escape.txt").exists()
+
+
+def test_normalize_file_map_input_accepts_plain_dict_items():
+    from kimi_coding_agent_v5 import _normalize_file_map_input
+
+    file_map = _normalize_file_map_input(
+        [{"path": "a.txt", "content": "A"}, {"path": "b.txt", "content": b"B"}]
+    )
+
+    assert [(item.path, item.content) for item in file_map.files] == [("a.txt", "A"), ("b.txt", "B")]
+
+
+def test_list_files_impl_default_pattern_lists_nested_entries(tmp_path):
+    from kimi_coding_agent_v5 import list_files_impl
+
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("# hi\n", encoding="utf-8")
+
+    files_only = list_files_impl(tmp_path)
+    with_dirs = list_files_impl(tmp_path, include_dirs=True)
+
+    assert sorted(item["path"] for item in files_only["files"]) == ["README.md", "src/pkg/mod.py"]
+    assert {"path": "src/pkg/mod.py", "is_dir": False, "size": 6} in files_only["files"]
+    assert sorted(item["path"] for item in with_dirs["files"] if item["is_dir"]) == ["src", "src/pkg"]
+
+
+def test_read_text_file_impl_refuses_files_over_max_bytes(tmp_path):
+    from kimi_coding_agent_v5 import read_text_file_impl
+
+    (tmp_path / "big.txt").write_text("x" * 64, encoding="utf-8")
+
+    assert read_text_file_impl(tmp_path, "big.txt", max_bytes=64)["content"] == "x" * 64
+    refused = read_text_file_impl(tmp_path, "big.txt", max_bytes=10)
+    assert refused["ok"] is False
+    assert refused["bytes"] == 64
+
+
+def test_write_text_file_impl_streams_list_content_newline_joined(tmp_path):
+    lines = ["Hello", "Wörld", 3]
+
+    result = write_text_file_impl(tmp_path, "out/lines.txt", iter(lines))
+
+    assert result["ok"] is True
+    expected = "\n".join(str(item) for item in lines)
+    assert (tmp_path / "out" / "lines.txt").read_text(encoding="utf-8") == expected
+    assert result["bytes"] == len(expected.encode("utf-8"))
+
+
+def test_write_text_file_impl_relative_base_follows_cwd(tmp_path, monkeypatch):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+
+    monkeypatch.chdir(first)
+    write_text_file_impl(Path("."), "a.txt", "one")
+    monkeypatch.chdir(second)
+    write_text_file_impl(Path("."), "a.txt", "two")
+
+    assert (first / "a.txt").read_text(encoding="utf-8") == "one"
+    assert (second / "a.txt").read_text(encoding="utf-8") == "two"
@@ -0,0 +1,61 @@
+from pathlib import Path
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("agents")
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from kimi_coding_agent_v_6_orig import _resolve_safe
+
+
+def test_resolve_safe_accepts_paths_below_base(tmp_path):
+    assert _resolve_safe(tmp_path, "src/app.py") == tmp_path.resolve() / "src" / "app.py"
+    assert _resolve_safe(tmp_path, "a/../b.txt") == tmp_path.resolve() / "b.txt"
+
+
+@pytest.mark.parametrize("target", ["../escape.txt", "a/../../x"])
+def test_resolve_safe_rejects_parent_traversal(tmp_path, target):
+    with pytest.raises(ValueError):
+        _resolve_safe(tmp_path / "base", target)
+
+
+def test_resolve_safe_rejects_sibling_with_shared_prefix(tmp_path):
+    (tmp_path / "base").mkdir()
+    with pytest.raises(ValueError):
+        _resolve_safe(tmp_path / "base", "../base-evil/x")
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unavailable")
+def test_resolve_safe_rejects_symlinked_subdir_created_after_first_lookup(tmp_path):
+    base = tmp_path / "base"
+    outside = tmp_path / "outside"
+    base.mkdir()
+    outside.mkdir()
+
+    # Resolve once while "link" is still missing, then swap in an escaping symlink
+    assert _resolve_safe(base, "link/x.txt") == base.resolve() / "link" / "x.txt"
+    try:
+        os.symlink(outside, base / "link", target_is_directory=True)
+    except OSError:
+        pytest.skip("cannot create symlinks here")
+
+    with pytest.raises(ValueError):
+        _resolve_safe(base, "link/x.txt")
+
+
+def test_resolve_safe_relative_base_follows_cwd(tmp_path, monkeypatch):
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+
+    monkeypatch.chdir(tmp_path / "first")
+    assert _resolve_safe(Path("."), "x.txt") == (tmp_path / "first").resolve() / "x.txt"
+    monkeypatch.chdir(tmp_path / "second")
+    assert _resolve_safe(Path("."), "x.txt") == (tmp_path / "second").resolve() / "x.txt"